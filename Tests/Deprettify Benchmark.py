@@ -0,0 +1,143 @@
+####
+#
+# Dreamy Utilities
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the package directory to the PATH variable.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+import dreamy_utilities.Text
+
+# Standard packages.
+
+import random
+from timeit import default_timer
+
+# Non-standard packages.
+
+import numpy
+
+#
+#
+#
+# Constants.
+#
+#
+#
+
+REPETITION_COUNT = 5
+NUMBER_COUNT = 200000
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def DeprettifyNumbersOneByOne(numbers):
+
+    ##
+    #
+    # Converts the numbers one by one (the reference implementation).
+    #
+    # @param numbers The input numbers.
+    #
+    # @return An array of integers.
+    #
+    ##
+
+    return numpy.array(
+        [dreamy_utilities.Text.DeprettifyNumber(x) for x in numbers],
+        dtype = numpy.int64
+    )
+
+def Measure(function, numbers) -> float:
+
+    ##
+    #
+    # Measures the best time of a conversion.
+    #
+    # @param function The function converting the numbers.
+    # @param numbers  The input numbers.
+    #
+    # @return The time, in seconds.
+    #
+    ##
+
+    bestTime = None
+
+    for _ in range(REPETITION_COUNT):
+        startTime = default_timer()
+        function(numbers)
+
+        elapsedTime = default_timer() - startTime
+        bestTime = elapsedTime if (bestTime is None) else min(bestTime, elapsedTime)
+
+    return bestTime
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+# Prepare the numbers.
+
+random.seed(0)
+
+plainNumbers = [f"{random.randint(0, 10 ** 7):,}" for _ in range(NUMBER_COUNT)]
+mixedNumbers = [
+    x if (index % 10) else random.choice(["", " 42 ", "-5", "?", "1.5"])
+    for index, x in enumerate(plainNumbers)
+]
+longNumbers = plainNumbers[:-1] + ["Lorem ipsum " * 16]
+
+datasets = {
+    "Plain (list)": plainNumbers,
+    "Mixed (list)": mixedNumbers,
+    "One long string (list)": longNumbers,
+    "Plain (array)": numpy.array(plainNumbers),
+}
+
+# Compare the conversions.
+
+for name, numbers in datasets.items():
+    referenceTime = Measure(DeprettifyNumbersOneByOne, numbers)
+    batchTime = Measure(dreamy_utilities.Text.DeprettifyNumbers, numbers)
+
+    print(
+        f"{name}: {batchTime:.3f} s (one by one: {referenceTime:.3f} s, "
+        f"{referenceTime / batchTime:.1f}x)."
+    )
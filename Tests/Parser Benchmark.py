@@ -0,0 +1,94 @@
+####
+#
+# Dreamy Utilities
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the package directory to the PATH variable.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+import dreamy_utilities.Filesystem
+import dreamy_utilities.HTML
+
+# Standard packages.
+
+from timeit import default_timer
+
+#
+#
+#
+# Constants.
+#
+#
+#
+
+REPETITION_COUNT = 5
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+# Read the pages.
+
+if len(sys.argv) < 2:
+    print("Usage: \"Parser Benchmark.py\" <the path to a directory containing saved pages>")
+    sys.exit(1)
+
+pages = [
+    dreamy_utilities.Filesystem.ReadTextFile(x)
+    for x in dreamy_utilities.Filesystem.FindFiles(sys.argv[1], suffixes = [".htm", ".html"])
+]
+
+pages = [x for x in pages if x]
+if not pages:
+    print("No pages found.")
+    sys.exit(1)
+
+print(f"Pages: {len(pages)} ({sum(len(x) for x in pages) / 1024 ** 2:.2f} MiB).")
+
+# Parse the pages using every available parser.
+
+for parser in dreamy_utilities.HTML.GetAvailableTagParsers():
+    bestTime = None
+
+    for _ in range(REPETITION_COUNT):
+        startTime = default_timer()
+
+        for page in pages:
+            dreamy_utilities.HTML.ParseHTML(page, parser)
+
+        elapsedTime = default_timer() - startTime
+        bestTime = elapsedTime if (bestTime is None) else min(bestTime, elapsedTime)
+
+    print(f"{parser}: {bestTime:.3f} s ({bestTime / len(pages) * 1000:.2f} ms per page).")
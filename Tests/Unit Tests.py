@@ -34,18 +34,35 @@ sys.path.insert(0, "../")
 
 # Application.
 
+import dreamy_utilities.AsyncWebSession
 import dreamy_utilities.Containers
 import dreamy_utilities.Filesystem
 import dreamy_utilities.HTML
 import dreamy_utilities.Mathematics
+import dreamy_utilities.RequestScheduler
+import dreamy_utilities.ResponseCache
+import dreamy_utilities.RetryPolicy
 import dreamy_utilities.Text
 import dreamy_utilities.Web
+import dreamy_utilities.WebSession
 
 # Standard packages.
 
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
 from pathlib import Path
+import pickle
+import tempfile
+import threading
+import time
 import unittest
 
+# Non-standard packages.
+
+import numpy
+import titlecase
+
 #
 #
 #
@@ -104,6 +121,113 @@ class TestHTML(unittest.TestCase):
             "One & Two < Four"
         )
 
+    def test_HTMLEntityTranslator(self):
+
+        translator = dreamy_utilities.HTML.HTMLEntityTranslator()
+
+        self.assertEqual(
+            translator.Translate("&NBSP;&Eacute;&eacute;&#65;&#x42;&ampC"),
+            "\xa0ÉéAB&C"
+        )
+
+        self.assertEqual(
+            "".join(translator.TranslateChunks(["One &a", "mp; Two &", "#6", "0; Four &"])),
+            "One & Two < Four &"
+        )
+
+        translator = dreamy_utilities.HTML.HTMLEntityTranslator(escape = True)
+
+        self.assertEqual(
+            "".join(translator.TranslateChunks(["One &a", "mp; Two &l", "t; Four"])),
+            "One &amp; Two &lt; Four"
+        )
+
+    def test_HTMLTextExtractor(self):
+
+        code = (
+            "<html><head><title>Title</title><style>p { color: red; }</style></head><body>"
+            "<p>One  <b>two</b>\nthree &amp; four</p><p>Five<br>six</p><script>var a;</script>"
+            "<ul><li>Seven</li><li>Eight</li></ul></body></html>"
+        )
+
+        lines = [
+            ("Title", True), ("One two three & four", True), ("Five", False), ("six", True),
+            ("Seven", True), ("Eight", True)
+        ]
+
+        self.assertEqual(list(dreamy_utilities.HTML.HTMLTextExtractor().Extract(code)), lines)
+
+        chunks = [code[index:index + 5].encode("utf-8") for index in range(0, len(code), 5)]
+
+        self.assertEqual(list(dreamy_utilities.HTML.HTMLTextExtractor().Extract(chunks)), lines)
+
+        # Empty lines end paragraphs too.
+
+        self.assertEqual(
+            list(dreamy_utilities.HTML.HTMLTextExtractor().Extract(
+                "<div>One<br>two<br> <br>Three<br></div><p>Four<br></p>"
+            )),
+            [("One", False), ("two", True), ("Three", True), ("Four", True)]
+        )
+
+    def test_ParseHTML(self):
+
+        self.assertIn("html.parser", dreamy_utilities.HTML.GetAvailableTagParsers())
+
+        for parser in dreamy_utilities.HTML.GetAvailableTagParsers():
+            soup = dreamy_utilities.HTML.ParseHTML("<p>One <b>Two</b></p>", parser)
+
+            self.assertEqual(dreamy_utilities.HTML.ReadElementText(soup, "b"), "Two")
+
+        self.assertEqual(
+            dreamy_utilities.HTML.ReadElementText("<div><p> One </p></div>", "div p"),
+            "One"
+        )
+
+        soup = dreamy_utilities.HTML.ParseHTML(
+            "<html><head><title>One</title></head><body><p>Two</p><div id='a'>Three</div></body></html>",
+            targets = ["title", "div#a"]
+        )
+
+        self.assertEqual(str(soup), "<title>One</title><div id=\"a\">Three</div>")
+
+        code = "<html><body><div><b>One</b><p>Two</p></div><p>Three</p></body></html>"
+
+        for parser in dreamy_utilities.HTML.GetAvailableTagParsers():
+            for selector in ["p:first-child", "p:not(:last-child)", "div p:first-child"]:
+                soup = dreamy_utilities.HTML.ParseHTML(code, parser, targets = [selector])
+
+                self.assertEqual(soup.select(selector), [])
+
+        self.assertFalse(dreamy_utilities.HTML.SelectorStrainer(["p:nth-child(2)"]).IsRestrictive())
+        self.assertTrue(dreamy_utilities.HTML.SelectorStrainer(["div p:first-child"]).IsRestrictive())
+
+    def test_ReadElementTexts(self):
+
+        soup = dreamy_utilities.HTML.ParseHTML(
+            "<html><head><title>One</title></head><body><p>Two</p><p class='a'> Three </p></body></html>"
+        )
+
+        self.assertEqual(
+            dreamy_utilities.HTML.ReadElementTexts(
+                soup,
+                {"Title": "title", "Text": "p.a", "First": "p, title", "Missing": "div", "Any": ".a", "ID": "#b"}
+            ),
+            {
+                "Title": "One", "Text": "Three", "First": "One", "Missing": None, "Any": "Three",
+                "ID": None
+            }
+        )
+
+        self.assertIs(
+            dreamy_utilities.HTML.CompileSelector("p.a"),
+            dreamy_utilities.HTML.CompileSelector("p.a")
+        )
+
+    def test_UnescapeHTMLEntities(self):
+
+        self.assertEqual(dreamy_utilities.HTML.UnescapeHTMLEntities(""), "")
+
 class TestMathematics(unittest.TestCase):
 
     def test_GetDimensionsToFit(self):
@@ -122,6 +246,73 @@ class TestText(unittest.TestCase):
             b"Test."
         )
 
+        self.assertEqual(
+            dreamy_utilities.Text.Bytify(bytearray(b"Test.")),
+            b"Test."
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.Bytify(memoryview(b"Test.")),
+            b"Test."
+        )
+
+    def test_CompiledTemplate(self):
+
+        template = dreamy_utilities.Text.CompiledTemplate(
+            "@@@Name@@@ is a @@@Species@@@ (@@@Age@@@, @@@_Hidden@@@)."
+        )
+
+        self.assertEqual(
+            template.Render({"Name": "Ben", "Species": "Human", "_Hidden": "X"}),
+            "Ben is a Human (@@@Age@@@, @@@_Hidden@@@)."
+        )
+
+        self.assertEqual(
+            template.RenderMany([
+                {"Name": "Ben", "Species": "Human", "Age": 30},
+                {"Name": "Rex", "Species": "Dog", "Age": 4},
+            ]),
+            [
+                "Ben is a Human (30, @@@_Hidden@@@).",
+                "Rex is a Dog (4, @@@_Hidden@@@).",
+            ]
+        )
+
+        outputFile = io.StringIO()
+
+        template.Write(
+            {"Name": "Ben", "Species": (x for x in ["Hu", "man"]), "Age": 30},
+            outputFile
+        )
+
+        self.assertEqual(
+            outputFile.getvalue(),
+            "Ben is a Human (30, @@@_Hidden@@@)."
+        )
+
+    def test_CompileExpression(self):
+
+        dreamy_utilities.Text.CompileExpression.cache_clear()
+
+        self.assertIs(
+            dreamy_utilities.Text.CompileExpression("(\\d+)"),
+            dreamy_utilities.Text.CompileExpression("(\\d+)")
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.CompileExpression.cache_info().hits,
+            1
+        )
+
+    def test_DateFormatter(self):
+
+        formatter = dreamy_utilities.Text.DateFormatter(locale = "pl")
+
+        self.assertEqual(
+            formatter.FormatMany(["2004-01-01", "?", "2021-12-31"]),
+            ["1 sty 2004", "?", "31 gru 2021"]
+        )
+
     def test_DeprettifyAmount(self):
 
         self.assertEqual(
@@ -129,6 +320,13 @@ class TestText(unittest.TestCase):
             (1036, 2316)
         )
 
+    def test_DeprettifyAmounts(self):
+
+        self.assertEqual(
+            dreamy_utilities.Text.DeprettifyAmounts(["1,036/2,316", "7/?", "", "12"]).tolist(),
+            [[1036, 2316], [7, 0], [0, 0], [0, 0]]
+        )
+
     def test_DeprettifyNumber(self):
 
         self.assertEqual(
@@ -146,6 +344,15 @@ class TestText(unittest.TestCase):
             1036
         )
 
+    def test_DeprettifyNumbers(self):
+
+        self.assertEqual(
+            dreamy_utilities.Text.DeprettifyNumbers(
+                ["", "003", "1,036", " 42 ", "-5", "abc", None]
+            ).tolist(),
+            [0, 3, 1036, 42, -5, 0, 0]
+        )
+
     def test_FillTemplate(self):
 
         self.assertEqual(
@@ -166,6 +373,31 @@ class TestText(unittest.TestCase):
             "1234"
         )
 
+    def test_FuzzyStringIndex(self):
+
+        index = dreamy_utilities.Text.FuzzyStringIndex(["kitten", "sitting", "mitten", "bitten"])
+        index.Add("kitchen")
+
+        self.assertEqual(
+            len(index),
+            5
+        )
+
+        self.assertEqual(
+            index.Find("kitten", 1),
+            [("kitten", 0), ("bitten", 1), ("mitten", 1)]
+        )
+
+        self.assertEqual(
+            index.FindNearest("sittin", 2),
+            [("sitting", 1), ("bitten", 2)]
+        )
+
+        self.assertEqual(
+            pickle.loads(pickle.dumps(index)).Find("kitchen", 0),
+            [("kitchen", 0)]
+        )
+
     def test_GetDateFromTimestamp(self):
 
         self.assertEqual(
@@ -173,6 +405,14 @@ class TestText(unittest.TestCase):
             "1973-03-03"
         )
 
+    def test_GetDisplayWidth(self):
+
+        self.assertEqual(dreamy_utilities.Text.GetDisplayWidth(""), 0)
+        self.assertEqual(dreamy_utilities.Text.GetDisplayWidth("Lorem"), 5)
+        self.assertEqual(dreamy_utilities.Text.GetDisplayWidth("日本語"), 6)
+        self.assertEqual(dreamy_utilities.Text.GetDisplayWidth("e\u0301"), 1)
+        self.assertEqual(dreamy_utilities.Text.GetDisplayWidth("\u0378"), 1)
+
     def test_GetLevenshteinDistance(self):
 
         self.assertEqual(
@@ -200,6 +440,47 @@ class TestText(unittest.TestCase):
             5
         )
 
+        self.assertEqual(
+            dreamy_utilities.Text.GetLevenshteinDistance("kitten", "sitting", maxDistance = 3),
+            3
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.GetLevenshteinDistance("kitten", "sitting", maxDistance = 2),
+            3
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.GetLevenshteinDistance("abc", "abcdefgh", maxDistance = 1),
+            2
+        )
+
+    def test_GetLevenshteinDistanceMatrix(self):
+
+        self.assertEqual(
+            dreamy_utilities.Text.GetLevenshteinDistanceMatrix(
+                ["", "a", "kitten"],
+                ["sitting", "a", "kitten"]
+            ).tolist(),
+            [
+                [7, 1, 6],
+                [7, 0, 6],
+                [3, 6, 0],
+            ]
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.GetLevenshteinDistanceMatrix(
+                ["kitten", "kitten"],
+                ["sitting", "kitchen"],
+                maxDistance = 2
+            ).tolist(),
+            [
+                [3, 2],
+                [3, 2],
+            ]
+        )
+
     def test_GetLongestLeadingSubstring(self):
 
         strings = [
@@ -214,6 +495,17 @@ class TestText(unittest.TestCase):
             "Perska Odyseja "
         )
 
+    def test_GetRomanNumeral(self):
+
+        self.assertEqual(
+            dreamy_utilities.Text.GetRomanNumerals([1, 4, 1994, 3999, 0, 4000]),
+            ["I", "IV", "MCMXCIV", "MMMCMXCIX", None, None]
+        )
+
+        self.assertEqual(dreamy_utilities.Text.GetRomanNumeral(numpy.int64(4)), "IV")
+        self.assertEqual(dreamy_utilities.Text.GetRomanNumeral(True), None)
+        self.assertEqual(dreamy_utilities.Text.GetRomanNumeral(4.0), None)
+
     def test_IsRomanNumeral(self):
 
         self.assertEqual(
@@ -231,6 +523,11 @@ class TestText(unittest.TestCase):
             True
         )
 
+        self.assertEqual(
+            dreamy_utilities.Text.IsRomanNumeral("IIIIV"),
+            False
+        )
+
         self.assertEqual(
             dreamy_utilities.Text.IsRomanNumeral("i"),
             False
@@ -268,6 +565,88 @@ class TestText(unittest.TestCase):
             True
         )
 
+    def test_MultiMatcher(self):
+
+        matcher = dreamy_utilities.Text.MultiMatcher({
+            "Words": "Words: ([\\d,]+)",
+            "Chapters": "Chapters: (\\d+)",
+            "Repeated": "(\\w)\\1",
+            "Missing": "Kudos: (\\d+)",
+        })
+
+        self.assertEqual(
+            matcher.Find("Words: 1,036 - Chapters: 12 - Items: aabb"),
+            {"Words": "1,036", "Chapters": "12", "Repeated": "a", "Missing": None}
+        )
+
+        cacheSize = dreamy_utilities.Text.CompileExpression.cache_info().currsize
+
+        self.assertEqual(
+            matcher.Find("Chapters: 3 - Chapters: 4 - Kudos: 5 - Words: 6"),
+            {"Words": "6", "Chapters": "3", "Repeated": None, "Missing": "5"}
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.CompileExpression.cache_info().currsize,
+            cacheSize
+        )
+
+    def test_NumberFormatter(self):
+
+        formatter = dreamy_utilities.Text.NumberFormatter(locale = "de", isZeroSpecial = True)
+
+        self.assertEqual(
+            formatter.FormatMany([0, 1000, 0.5]),
+            ["?", "1.000", "0,5"]
+        )
+
+    def test_ParseRomanNumeral(self):
+
+        self.assertEqual(
+            dreamy_utilities.Text.ParseRomanNumerals(["MCMXCIV", " IX ", "IIX", "ix", ""]),
+            [1994, 9, None, None, None]
+        )
+
+    def test_PrefixTrie(self):
+
+        trie = dreamy_utilities.Text.PrefixTrie([
+            "Perska Odyseja XIX: Wspólny wróg",
+            "Perska Odyseja XVIII: Oblężenie",
+            "Perska Odyseja II: Trzy zdrady",
+        ])
+
+        trie.Add("Perska Odyseja XVII: Oprawcy i tchórze")
+
+        self.assertEqual(
+            trie.GetLongestLeadingSubstring(),
+            "Perska Odyseja "
+        )
+
+        self.assertEqual(
+            trie.GetLongestLeadingSubstring("Perska Odyseja XV"),
+            "Perska Odyseja XVII"
+        )
+
+        self.assertEqual(
+            trie.GetLongestLeadingSubstring("Odyseja"),
+            None
+        )
+
+        self.assertEqual(
+            trie.GetCommonPrefix([
+                "Perska Odyseja XIX: Wspólny wróg",
+                "Perska Odyseja XVII: Oprawcy i tchórze",
+            ]),
+            "Perska Odyseja X"
+        )
+
+        self.assertEqual(
+            trie.GetCommonPrefix(["Perska Odyseja II: Trzy zdrady"]),
+            "Perska Odyseja II: Trzy zdrady"
+        )
+        self.assertEqual(trie.GetCommonPrefix(["Perska Odyseja"]), None)
+        self.assertEqual(trie.GetCommonPrefix([]), None)
+
     def test_PrettifyDate(self):
 
         self.assertEqual(
@@ -280,6 +659,9 @@ class TestText(unittest.TestCase):
             "Jan 1, 2004"
         )
 
+        with self.assertRaises(ValueError):
+            dreamy_utilities.Text.PrettifyDate("2021-W01-5")
+
     def test_PrettifyNumber(self):
 
         self.assertEqual(
@@ -354,6 +736,16 @@ class TestText(unittest.TestCase):
             "Lorem Ipsum Dolor"
         )
 
+    def test_PrettifyTitles(self):
+
+        self.assertEqual(
+            dreamy_utilities.Text.PrettifyTitles(
+                ["Chapter 1: Lorem ipsum", "Chapter 2: Dolor sit amet", "Chapter 1: Lorem ipsum"],
+                removeContext = True
+            ),
+            ["Lorem Ipsum", "Dolor Sit Amet", "Lorem Ipsum"]
+        )
+
     def test_SeparateSubtitle(self):
 
         self.assertEqual(
@@ -371,6 +763,20 @@ class TestText(unittest.TestCase):
             "Lorem ipsum dolor"
         )
 
+    def test_SubtitleSeparator(self):
+
+        separator = dreamy_utilities.Text.SubtitleSeparator()
+
+        self.assertEqual(
+            separator.SeparateMany(["Chapter 1: Lorem ipsum", "My Story - Lorem ipsum", "Lorem", ""]),
+            [("Chapter 1", "Lorem ipsum"), ("My Story", "Lorem ipsum"), ("", "Lorem"), None]
+        )
+
+        self.assertEqual(
+            separator.SeparateSubtitles(["My Story 2.: Lorem - ipsum", "My Story 2.: Lorem - ipsum"]),
+            ["Lorem : ipsum", "Lorem : ipsum"]
+        )
+
     def test_Stringify(self):
 
         self.assertEqual(
@@ -393,6 +799,99 @@ class TestText(unittest.TestCase):
             "142"
         )
 
+        self.assertEqual(
+            dreamy_utilities.Text.Stringify(bytearray("Zażółć.".encode("utf-8"))),
+            "Zażółć."
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.Stringify(memoryview("Zażółć.".encode("cp1250")), "cp1250"),
+            "Zażółć."
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.Stringify(numpy.int64(5)),
+            "5"
+        )
+
+        self.assertEqual(
+            dreamy_utilities.Text.Stringify("日本".encode("iso2022_jp"), "iso2022_jp"),
+            "日本"
+        )
+
+    def test_StringifyChunks(self):
+
+        text = "Zażółć gęślą jaźń. " * 10
+        data = text.encode("utf-8")
+
+        for chunkSize in [1, 2, 3, 64]:
+            chunks = [data[index:index + chunkSize] for index in range(0, len(data), chunkSize)]
+
+            self.assertEqual(
+                "".join(dreamy_utilities.Text.StringifyChunks(chunks)),
+                text
+            )
+
+            self.assertEqual(
+                "".join(dreamy_utilities.Text.StringifyChunks(io.BytesIO(data), chunkSize = chunkSize)),
+                text
+            )
+
+            self.assertEqual(
+                "".join(dreamy_utilities.Text.StringifyChunks(bytearray(data), chunkSize = chunkSize)),
+                text
+            )
+
+        self.assertEqual(
+            list(dreamy_utilities.Text.StringifyChunks(None)),
+            []
+        )
+
+        data = ("Tekst " + "日本" * 100).encode("iso2022_jp")
+        chunks = [data[index:index + 5] for index in range(0, len(data), 5)]
+
+        self.assertEqual(
+            "".join(dreamy_utilities.Text.StringifyChunks(chunks, "iso2022_jp")),
+            "Tekst " + "日本" * 100
+        )
+
+    def test_Titlecase(self):
+
+        titles = [
+            "the lord of the rings: the return of the king",
+            "HARRY POTTER AND THE METHODS OF RATIONALITY",
+            "a tale of two cities",
+            "what is this thing called love?",
+            "star wars - a new hope",
+            "my iPhone and the BBC (part 2)",
+            "dr jekyll and mr hyde",
+            "the old man and the sea, part one",
+            "o'neil's mcdonald's e.g. a/b x-y",
+            "żółta łódź podwodna",
+            "",
+        ]
+
+        for title in titles:
+
+            self.assertEqual(
+                dreamy_utilities.Text.Titlecase(title),
+                titlecase.titlecase(title)
+            )
+
+    def test_TitleNormalizer(self):
+
+        normalizer = dreamy_utilities.Text.TitleNormalizer(prefixes = ["Episode \\d+"])
+
+        self.assertEqual(
+            normalizer.Normalize("Episode 4: a new hope", removeContext = True),
+            "A New Hope"
+        )
+
+        self.assertEqual(
+            normalizer.Normalize("Chapter 4: a new hope", removeContext = True),
+            "Chapter 4: A New Hope"
+        )
+
     def test_Truncate(self):
 
         self.assertEqual(
@@ -415,6 +914,39 @@ class TestText(unittest.TestCase):
             "Lorem ipsum d…"
         )
 
+    def test_Truncator(self):
+
+        truncator = dreamy_utilities.Text.Truncator("width")
+
+        self.assertEqual(
+            truncator.TruncateMany(["日本語の文章です", "Lorem ipsum", "Zażółć gęślą jaźń"], 10),
+            ["日本語の…", "Lorem ips…", "Zażółć gę…"]
+        )
+
+        self.assertEqual(
+            truncator.TruncateManyByWords(["日本 語の 文章です", "Lorem ipsum dolor"], 13),
+            ["日本 語の…", "Lorem ipsum…"]
+        )
+
+        truncator = dreamy_utilities.Text.Truncator("graphemes", suffix = "...")
+
+        self.assertEqual(
+            truncator.MeasureMany(["e\u0301e\u0301", "🇵🇱🇩🇪", "👨\u200d👩\u200d👧", "a\r\nb"]),
+            [2, 2, 1, 3]
+        )
+
+        self.assertEqual(
+            truncator.Truncate("e\u0301e\u0301e\u0301e\u0301e\u0301", 4),
+            "e\u0301..."
+        )
+
+        truncator = dreamy_utilities.Text.Truncator()
+
+        self.assertEqual(
+            truncator.TruncateMany(["Lorem ipsum dolor sit amet"] * 2, 12),
+            ["Lorem ipsum…", "Lorem ipsum…"]
+        )
+
 class TestWeb(unittest.TestCase):
 
     def test_GetHostname(self):
@@ -446,11 +978,230 @@ class TestWeb(unittest.TestCase):
             "https://harrypotterfanfiction.com"
         )
 
+    def test_ParseRetryAfter(self):
+
+        self.assertEqual(dreamy_utilities.Web.ParseRetryAfter(" 120 "), 120.0)
+        self.assertEqual(dreamy_utilities.Web.ParseRetryAfter("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(dreamy_utilities.Web.ParseRetryAfter("²"))
+        self.assertIsNone(dreamy_utilities.Web.ParseRetryAfter(None))
+
     _TEST_URL_1 = "https://forums.spacebattles.com/threads/star-wars-a-penumbral-path.814685"
     _TEST_URL_2 = "https://archiveofourown.org/works/25981912/chapters/63166141"
     _TEST_URL_3 = "https://harrypotterfanfiction.com/viewstory.php?psid=327112"
     _TEST_URL_4 = "https://najlepszaerotyka.com.pl/2018/03/01/blondynka-wedug-megasa-alexandrosa/"
 
+class TestWebSession(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls._server = ThreadingHTTPServer(("127.0.0.1", 0), TestHTTPRequestHandler)
+        cls._serverURL = f"http://127.0.0.1:{cls._server.server_address[1]}"
+
+        threading.Thread(target = cls._server.serve_forever, daemon = True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls._server.shutdown()
+        cls._server.server_close()
+
+    def test_AsyncWebSession(self):
+
+        async def Test():
+
+            async with dreamy_utilities.AsyncWebSession.AsyncWebSession() as session:
+
+                self.assertEqual(await session.Get(f"{self._serverURL}/200/One"), "<p>One</p>")
+                self.assertIsNone(await session.Get(f"{self._serverURL}/404/One"))
+
+                soup = await session.GetSoup(f"{self._serverURL}/200/Two")
+                self.assertEqual(soup.p.get_text(), "Two")
+
+                chunks = await session.GetChunks(f"{self._serverURL}/200/Three", chunkSize = 2)
+                self.assertEqual("".join([x async for x in chunks]), "<p>Three</p>")
+
+                URLs = [f"{self._serverURL}/200/{index}" for index in range(10)]
+                results = await session.GetMany(URLs, maxWorkers = 4)
+
+                self.assertEqual([x[1] for x in results], [f"<p>{x}</p>" for x in range(10)])
+
+        asyncio.run(Test())
+
+    def test_GetChunks(self):
+
+        session = dreamy_utilities.WebSession.WebSession()
+
+        chunks = session.GetChunks(f"{self._serverURL}/200/One", chunkSize = 2)
+        self.assertEqual("".join(chunks), "<p>One</p>")
+
+        self.assertIsNone(session.GetChunks(f"{self._serverURL}/404/Two"))
+
+    def test_GetMany(self):
+
+        session = dreamy_utilities.WebSession.WebSession()
+
+        URLs = [f"{self._serverURL}/200/{index}" for index in range(10)]
+        URLs[3] = f"{self._serverURL}/404/3"
+
+        results = session.GetMany(URLs, maxWorkers = 4)
+
+        self.assertEqual([x[0] for x in results], URLs)
+        self.assertEqual(results[0][1], "<p>0</p>")
+        self.assertIsNone(results[3][1])
+        self.assertTrue(all((x[2] is None) for x in results))
+
+        results = list(session.GetMany(URLs + ["http://127.0.0.1:1/"], asCompleted = True))
+
+        self.assertEqual(sorted(x[0] for x in results), sorted(URLs + ["http://127.0.0.1:1/"]))
+        self.assertEqual(sum(1 for x in results if x[2] is not None), 1)
+
+    def test_RequestScheduler(self):
+
+        scheduler = dreamy_utilities.RequestScheduler.RequestScheduler(
+            requestsPerSecond = 20,
+            burstSize = 1,
+            initialBackoff = 0.2
+        )
+
+        session = dreamy_utilities.WebSession.WebSession(scheduler = scheduler)
+
+        startTime = time.monotonic()
+        session.GetMany([f"{self._serverURL}/200/{index}" for index in range(5)])
+
+        self.assertGreaterEqual(time.monotonic() - startTime, 0.2)
+
+        self.assertIsNone(session.Get(f"{self._serverURL}/429/Two"))
+        self.assertGreater(scheduler.GetDelay(self._serverURL), 0.1)
+
+        startTime = time.monotonic()
+        session.Get(f"{self._serverURL}/200/Three")
+
+        self.assertGreater(time.monotonic() - startTime, 0.1)
+        self.assertEqual(scheduler.GetDelay(self._serverURL), 0)
+
+        with self.assertRaises(ValueError):
+            dreamy_utilities.RequestScheduler.RequestScheduler(requestsPerSecond = 0)
+
+        with self.assertRaises(ValueError):
+            dreamy_utilities.RequestScheduler.RequestScheduler(maxConcurrentRequests = 0)
+
+    def test_ResponseCache(self):
+
+        with dreamy_utilities.ResponseCache.ResponseCache(":memory:", maxSize = 30) as cache:
+
+            session = dreamy_utilities.WebSession.WebSession(cache = cache)
+
+            self.assertEqual(session.Get(f"{self._serverURL}/200/One"), "<p>One</p>")
+            self.assertEqual(cache.Get(f"{self._serverURL}/200/One").ETag, '"One"')
+            self.assertFalse(cache.Get(f"{self._serverURL}/200/One").isFresh)
+
+            self.assertEqual(session.Get(f"{self._serverURL}/200/One"), "<p>One</p>")
+            self.assertEqual(session.GetSoup(f"{self._serverURL}/200/One").p.get_text(), "One")
+            self.assertIsNone(session.Get(f"{self._serverURL}/404/Two"))
+
+            session.Get(f"{self._serverURL}/200/Three")
+            session.Get(f"{self._serverURL}/200/Four")
+
+            self.assertIsNone(cache.Get(f"{self._serverURL}/200/One"))
+            self.assertEqual(cache.Get(f"{self._serverURL}/200/Four").content, b"<p>Four</p>")
+            self.assertEqual(cache.GetSize(), 23)
+
+            # Responses which can't be revalidated are useless without a time-to-live.
+
+            self.assertFalse(cache.Store("https://example.com/", b"<p>Five</p>"))
+            self.assertIsNone(cache.Get("https://example.com/"))
+
+        with dreamy_utilities.ResponseCache.ResponseCache(":memory:", timeToLive = 60) as cache:
+
+            cache.Store("https://example.com/", b"<p>Cached</p>")
+
+            session = dreamy_utilities.WebSession.WebSession(cache = cache)
+
+            self.assertEqual(
+                session.Get("https://example.com/", withAttemptCount = True),
+                ("<p>Cached</p>", 0)
+            )
+
+        # Instances sharing a database see each other's responses, and evict them if needed.
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "Cache.sqlite"
+
+            with dreamy_utilities.ResponseCache.ResponseCache(path, maxSize = 10) as firstCache:
+                with dreamy_utilities.ResponseCache.ResponseCache(path, maxSize = 10) as secondCache:
+
+                    firstCache.Store("https://example.com/1", b"12345", '"1"')
+                    secondCache.Store("https://example.com/2", b"123", '"2"')
+
+                    self.assertEqual(firstCache.GetSize(), 8)
+
+                    firstCache.Store("https://example.com/3", b"1234", '"3"')
+
+                    self.assertIsNone(secondCache.Get("https://example.com/1"))
+                    self.assertEqual(secondCache.GetSize(), 7)
+
+    def test_RetryPolicy(self):
+
+        retryPolicy = dreamy_utilities.RetryPolicy.RetryPolicy(maxAttempts = 3, initialDelay = 0.01)
+        session = dreamy_utilities.WebSession.WebSession(retryPolicy = retryPolicy)
+
+        self.assertEqual(
+            session.Get(f"{self._serverURL}/502/One", withAttemptCount = True),
+            (None, 3)
+        )
+
+        self.assertEqual(
+            session.Get(f"{self._serverURL}/200/Two", withAttemptCount = True),
+            ("<p>Two</p>", 1)
+        )
+
+        URLs = [f"{self._serverURL}/404/Three", f"{self._serverURL}/503/Four"]
+
+        self.assertEqual(
+            [x[3] for x in session.GetMany(URLs, withAttemptCounts = True)],
+            [1, 3]
+        )
+
+        self.assertTrue(retryPolicy.IsRetryable(503))
+        self.assertFalse(retryPolicy.IsRetryable(404))
+        self.assertFalse(retryPolicy.ShouldRetry(3, 0, 0, 503))
+        self.assertLessEqual(retryPolicy.GetDelay(2), 0.02)
+
+        self.assertEqual(retryPolicy.GetDelay(1, retryAfter = 120), 120)
+        self.assertIsNone(retryPolicy.GetDelay(1, retryAfter = 3600))
+        self.assertFalse(retryPolicy.ShouldRetry(1, 0, None, 503))
+
+##
+#
+# Serves the pages used by *TestWebSession*. The path "/<status>/<text>" returns given status code,
+# and given text in a paragraph. The text is also used as the ETag.
+#
+##
+
+class TestHTTPRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+
+        _, status, text = self.path.split("/", 2)
+
+        body = f"<p>{text}</p>".encode("utf-8")
+        ETag = f'"{text}"'
+
+        if self.headers.get("If-None-Match") == ETag:
+            status, body = 304, b""
+
+        self.send_response(int(status))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETag)
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+
+        pass
+
 #
 #
 #
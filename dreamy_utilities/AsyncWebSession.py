@@ -0,0 +1,457 @@
+####
+#
+# Dreamy Utilities
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from dreamy_utilities.HTML import ParseHTML
+from dreamy_utilities.Text import Stringify
+from dreamy_utilities.WebSession import (
+    CONNECTION_POOL_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_TAG_PARSER,
+    DEFAULT_TEXT_ENCODING,
+    DEFAULT_WORKER_COUNT,
+)
+
+# Standard packages.
+
+import asyncio
+import codecs
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+# Non-standard packages.
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Represents a web session, for use with *asyncio*. Mirrors *WebSession* (without the
+# cloudscraper): connections are pooled, and the tag soup is parsed outside of the event loop.
+#
+##
+
+class AsyncWebSession:
+
+    def __init__(
+        self,
+        userAgent: str = "",
+        executor: Optional[Executor] = None
+    ) -> None:
+
+        ##
+        #
+        # The constructor. The underlying HTTP session is created when first needed, and should be
+        # closed using *Close* (or by using the object as an asynchronous context manager).
+        #
+        # @param userAgent The user-agent to be used.
+        # @param executor  The executor used to parse the tag soup. Optional; by default, the
+        #                  default executor of the event loop is used.
+        #
+        ##
+
+        self._userAgent = userAgent
+        self._executor = executor
+
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncWebSession":
+
+        ##
+        #
+        # Enters the context.
+        #
+        # @return The session.
+        #
+        ##
+
+        return self
+
+    async def __aexit__(self, *arguments) -> None:
+
+        ##
+        #
+        # Exits the context, closing the session.
+        #
+        ##
+
+        await self.Close()
+
+    async def Close(self) -> None:
+
+        ##
+        #
+        # Closes the session. It will be reopened if another request is made.
+        #
+        ##
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def Get(
+        self,
+        URL: str,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Retrieves data using a GET request.
+        #
+        # @param URL          The URL.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        #
+        # @return Retrieved response (as *bytes* or *str*), or **None**.
+        #
+        ##
+
+        # Send the request.
+
+        async with self._GetSession().get(URL, headers = self._GetHeaders()) as response:
+            if 200 != response.status:
+                return None
+
+            data = await response.read()
+
+        # Process the response.
+
+        return Stringify(data, encoding = textEncoding) if text else data
+
+    async def GetChunks(
+        self,
+        URL: str,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING,
+        chunkSize: int = DEFAULT_CHUNK_SIZE
+    ) -> Optional[Union[AsyncIterator[bytes], AsyncIterator[str]]]:
+
+        ##
+        #
+        # Retrieves data using a GET request, piece by piece (without keeping the whole response in
+        # memory).
+        #
+        # @param URL          The URL.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        # @param chunkSize    The size of the chunks read from the response.
+        #
+        # @return An asynchronous iterator over the chunks of the response (*bytes* or *str*), or
+        #         **None**.
+        #
+        ##
+
+        response = await self._GetSession().get(URL, headers = self._GetHeaders())
+        if 200 != response.status:
+            response.release()
+            return None
+
+        return self._IterateChunks(response, text, textEncoding, chunkSize)
+
+    async def GetElements(
+        self,
+        URL: str,
+        selectors: Iterable[str],
+        parser: Optional[str] = DEFAULT_TAG_PARSER
+    ) -> Optional[Dict[str, List[str]]]:
+
+        ##
+        #
+        # Retrieves the texts of the elements matching given CSS selectors (see
+        # *WebSession.GetElements*).
+        #
+        # @param URL       The URL.
+        # @param selectors The CSS selectors (or tag names).
+        # @param parser    The tag parser to be used. Optional.
+        #
+        # @return A dictionary mapping each selector to the (stripped) texts of the matching
+        #         elements, or **None**.
+        #
+        ##
+
+        selectors = list(selectors)
+
+        soup = await self.GetSoup(URL, parser, targets = selectors)
+        if not soup:
+            return None
+
+        return {
+            selector: [element.get_text().strip() for element in soup.select(selector)]
+            for selector in selectors
+        }
+
+    async def GetMany(
+        self,
+        URLs: Iterable[str],
+        maxWorkers: int = DEFAULT_WORKER_COUNT,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING
+    ) -> List[Tuple[str, Any, Optional[Exception]]]:
+
+        ##
+        #
+        # Retrieves data using multiple concurrent GET requests (see *WebSession.GetMany*).
+        #
+        # @param URLs         The URLs.
+        # @param maxWorkers   The maximum number of concurrent requests.
+        # @param text         Should the responses be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        #
+        # @return A list of tuples (URL, retrieved response or **None**, raised exception or
+        #         **None**), in the order of the URLs.
+        #
+        ##
+
+        semaphore = asyncio.Semaphore(maxWorkers)
+
+        return await asyncio.gather(
+            *[self._GetSafely(x, text, textEncoding, semaphore) for x in URLs]
+        )
+
+    async def GetManyAsCompleted(
+        self,
+        URLs: Iterable[str],
+        maxWorkers: int = DEFAULT_WORKER_COUNT,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING
+    ) -> AsyncIterator[Tuple[str, Any, Optional[Exception]]]:
+
+        ##
+        #
+        # Retrieves data using multiple concurrent GET requests, returning the results as soon as
+        # they are available (see *GetMany*).
+        #
+        # @param URLs         The URLs.
+        # @param maxWorkers   The maximum number of concurrent requests.
+        # @param text         Should the responses be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        #
+        # @return An asynchronous iterator over tuples (URL, retrieved response, raised exception),
+        #         in the order of completion.
+        #
+        ##
+
+        semaphore = asyncio.Semaphore(maxWorkers)
+
+        tasks = [
+            asyncio.ensure_future(self._GetSafely(x, text, textEncoding, semaphore)) for x in URLs
+        ]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+
+        finally:
+
+            # Don't send the remaining requests if the caller stops early.
+
+            for task in tasks:
+                task.cancel()
+
+    async def GetSoup(
+        self,
+        URL: str,
+        parser: Optional[str] = DEFAULT_TAG_PARSER,
+        targets: Optional[Iterable[str]] = None
+    ) -> Optional[BeautifulSoup]:
+
+        ##
+        #
+        # Retrieves tag soup using a GET request. The soup is parsed by the executor, so that the
+        # event loop isn't blocked.
+        #
+        # @param URL     The URL.
+        # @param parser  The tag parser to be used. Optional; by default, the fastest available
+        #                parser (*DEFAULT_TAG_PARSER*, see *HTML.GetDefaultTagParser*).
+        # @param targets CSS selectors (or tag names) of the elements of interest. Optional (see
+        #                *WebSession.GetSoup*).
+        #
+        # @return Retrieved tag soup, or **None**.
+        #
+        ##
+
+        # Get the data.
+
+        data = await self.Get(URL)
+        if not data:
+            return None
+
+        # Create the tag soup.
+
+        targets = list(targets) if (targets is not None) else None
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            ParseHTML,
+            data,
+            parser,
+            targets
+        )
+
+    async def Post(
+        self,
+        URL: str,
+        payload,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Posts some data and receives the response.
+        #
+        # @param URL          The URL.
+        # @param payload      The data to be posted.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        #
+        # @return Retrieved response (as *bytes* or *str*), or **None**.
+        #
+        ##
+
+        # Send the request.
+
+        session = self._GetSession()
+
+        async with session.post(URL, headers = self._GetHeaders(), data = payload) as response:
+            if 200 != response.status:
+                return None
+
+            data = await response.read()
+
+        # Process the response.
+
+        return Stringify(data, encoding = textEncoding) if text else data
+
+    def _GetHeaders(self) -> Dict[str, str]:
+
+        ##
+        #
+        # Returns the headers sent with every request.
+        #
+        # @return The headers.
+        #
+        ##
+
+        return {
+            "User-Agent": self._userAgent
+        }
+
+    def _GetSession(self) -> aiohttp.ClientSession:
+
+        ##
+        #
+        # Returns the underlying HTTP session, creating it when first needed.
+        #
+        # @return The session.
+        #
+        ##
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector = aiohttp.TCPConnector(limit_per_host = CONNECTION_POOL_SIZE)
+            )
+
+        return self._session
+
+    async def _GetSafely(
+        self,
+        URL: str,
+        text: bool,
+        textEncoding: str,
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[str, Any, Optional[Exception]]:
+
+        ##
+        #
+        # Retrieves data using a GET request (see *Get*), catching the exceptions.
+        #
+        # @param URL          The URL.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        # @param semaphore    The semaphore limiting the number of concurrent requests.
+        #
+        # @return A tuple (URL, retrieved response or **None**, raised exception or **None**).
+        #
+        ##
+
+        async with semaphore:
+
+            try:
+                return URL, await self.Get(URL, text, textEncoding), None
+
+            except Exception as exception:
+                return URL, None, exception
+
+    async def _IterateChunks(
+        self,
+        response: aiohttp.ClientResponse,
+        text: bool,
+        textEncoding: str,
+        chunkSize: int
+    ) -> Union[AsyncIterator[bytes], AsyncIterator[str]]:
+
+        ##
+        #
+        # Reads a response piece by piece (see *GetChunks*), and releases it afterwards.
+        #
+        # @param response     The response.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        # @param chunkSize    The size of the chunks read from the response.
+        #
+        # @return An asynchronous iterator over the chunks of the response.
+        #
+        ##
+
+        decoder = codecs.getincrementaldecoder(textEncoding)(errors = "ignore") if text else None
+
+        try:
+            async for chunk in response.content.iter_chunked(chunkSize):
+                chunk = decoder.decode(chunk) if decoder else chunk
+                if chunk:
+                    yield chunk
+
+            if decoder:
+                chunk = decoder.decode(b"", final = True)
+                if chunk:
+                    yield chunk
+
+        finally:
+            response.release()
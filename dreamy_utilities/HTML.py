@@ -26,15 +26,87 @@
 #
 #
 
+# Application.
+
+from dreamy_utilities.Text import StringifyChunks
+
 # Standard packages.
 
+from functools import lru_cache
 import html
+from html.entities import html5 as HTML5_ENTITIES
+from html.parser import HTMLParser
 import re
-from typing import Optional
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
 # Non-standard packages.
 
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+from bs4.filter import ElementFilter
+import soupsieve
+
+#
+#
+#
+# Constants.
+#
+#
+#
+
+# Matches character references, just like *html.unescape* does.
+
+HTML_ENTITY_EXPRESSION = re.compile(
+    "&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\\t\\n\\f <&#;]{1,32};?)"
+)
+
+# Incomplete character references which may still become valid ones.
+
+INCOMPLETE_HTML_ENTITIES = frozenset(["&", "&#", "&#x", "&#X"])
+
+# Tag parsers, from the fastest to the slowest. Only the built-in *html.parser* is always available.
+
+TAG_PARSERS = [
+    "lxml",
+    "html.parser",
+]
+
+# Parts of CSS selectors ignored while looking for the first compound selector (see
+# *SelectorStrainer*): attribute selectors, arguments of pseudo-classes and quoted strings.
+
+SELECTOR_IGNORED_PARTS_EXPRESSION = re.compile("\\[[^\\]]*\\]|\\([^)]*\\)|\"[^\"]*\"|'[^']*'")
+
+# Matches the tag name, the ID and the classes at the beginning of a CSS selector.
+
+SELECTOR_COMPOUND_EXPRESSION = re.compile("\\s*(\\*|[A-Za-z][\\w-]*)?((?:[#.][\\w-]+)*)")
+
+SELECTOR_COMBINATOR_EXPRESSION = re.compile("[\\s>+~]+")
+
+# Pseudo-classes depending on the siblings (or the parent) of an element. Elements matched by them
+# may be anywhere in the document (see *SelectorStrainer*): once the document is strained, elements
+# have different siblings.
+
+SELECTOR_STRUCTURAL_PSEUDO_CLASS_EXPRESSION = re.compile(
+    ":(?:first-child|last-child|only-child|nth-[\\w-]+|[\\w-]+-of-type|root|empty)(?![\\w-])",
+    re.IGNORECASE
+)
+
+SELECTOR_CACHE_SIZE = 512
+
+# Elements separating blocks of text (see *HTMLTextExtractor*).
+
+BLOCK_TAGS = frozenset([
+    "address", "article", "aside", "blockquote", "body", "caption", "center", "dd", "details",
+    "dialog", "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "summary", "table", "td", "th", "title", "tr", "ul",
+])
+
+# Elements whose content is not text.
+
+IGNORED_TEXT_TAGS = frozenset(["noscript", "script", "style", "template"])
+
+TEXT_WHITESPACE_EXPRESSION = re.compile("[ \\t\\n\\r\\f]+")
 
 #
 #
@@ -44,11 +116,28 @@ from bs4 import BeautifulSoup
 #
 #
 
+@lru_cache(maxsize = SELECTOR_CACHE_SIZE)
+def CompileSelector(selector: str) -> soupsieve.SoupSieve:
+
+    ##
+    #
+    # Compiles a CSS selector, caching the result. The statistics of the cache can be read using
+    # *CompileSelector.cache_info()*.
+    #
+    # @param selector The CSS selector.
+    #
+    # @return The compiled selector.
+    #
+    ##
+
+    return soupsieve.compile(selector)
+
 def EscapeHTMLEntities(code: str) -> str:
 
     ##
     #
-    # Escapes HTML entities in code.
+    # Escapes HTML entities in code. Entities already present in the code are unescaped first (see
+    # *UnescapeHTMLEntities*), so that they are not escaped twice.
     #
     # @param code The input code.
     #
@@ -59,17 +148,67 @@ def EscapeHTMLEntities(code: str) -> str:
     if not code:
         return code
 
-    code = UnescapeHTMLEntities(code)
+    return _GetHTMLEntityTranslator(escape = True).Translate(code)
+
+def GetAvailableTagParsers() -> List[str]:
+
+    ##
+    #
+    # Returns the tag parsers which can be used (see *TAG_PARSERS*).
+    #
+    # @return The names of the parsers, from the fastest to the slowest.
+    #
+    ##
+
+    return [x for x in TAG_PARSERS if builder_registry.lookup(x)]
 
-    return html.escape(code)
+@lru_cache(maxsize = None)
+def GetDefaultTagParser() -> str:
 
-def ReadElementText(soup: BeautifulSoup, tagName: str) -> Optional[str]:
+    ##
+    #
+    # Returns the fastest available tag parser (see *TAG_PARSERS*).
+    #
+    # @return The name of the parser.
+    #
+    ##
+
+    return GetAvailableTagParsers()[0]
+
+def ParseHTML(
+    code: Union[bytes, str],
+    parser: Optional[str] = None,
+    targets: Optional[Iterable[str]] = None
+) -> BeautifulSoup:
+
+    ##
+    #
+    # Creates tag soup from HTML code.
+    #
+    # @param code    The code.
+    # @param parser  The tag parser to be used. Optional; the fastest available parser is used by
+    #                default (see *GetDefaultTagParser*).
+    # @param targets CSS selectors (or tag names) of the elements of interest. Optional; if
+    #                provided, only the subtrees which may contain these elements are built (see
+    #                *SelectorStrainer*).
+    #
+    # @return The tag soup.
+    #
+    ##
+
+    strainer = SelectorStrainer(targets) if (targets is not None) else None
+    if strainer and not strainer.IsRestrictive():
+        strainer = None
+
+    return BeautifulSoup(code, features = parser or GetDefaultTagParser(), parse_only = strainer)
+
+def ReadElementText(soup: Union[BeautifulSoup, str], tagName: str) -> Optional[str]:
 
     ##
     #
     # Returns the content of the first found element of given name.
     #
-    # @param soup    The input tag soup.
+    # @param soup    The input tag soup, or HTML code (see *ParseHTML*).
     # @param tagName The name of the tag.
     #
     # @return The content of the found element, or **None**.
@@ -79,17 +218,94 @@ def ReadElementText(soup: BeautifulSoup, tagName: str) -> Optional[str]:
     if (not soup) or (not tagName):
         return None
 
-    element = soup.select_one(tagName)
+    if isinstance(soup, str):
+        soup = ParseHTML(soup)
+
+    element = CompileSelector(tagName).select_one(soup)
     if not element:
         return None
 
     return element.get_text().strip()
 
+def ReadElementTexts(
+    soup: Union[BeautifulSoup, str],
+    selectors: Dict[str, str]
+) -> Dict[str, Optional[str]]:
+
+    ##
+    #
+    # Returns the contents of the first found elements matching given CSS selectors (see
+    # *ReadElementText*). The tag soup is traversed only once; each selector is then matched only
+    # against the elements with the right tag names. Selectors which may match elements with any
+    # name (e.g. "#summary") are looked up separately.
+    #
+    # @param soup      The input tag soup, or HTML code (see *ParseHTML*).
+    # @param selectors A dictionary mapping names to CSS selectors (or tag names).
+    #
+    # @return A dictionary mapping the names to the contents of the found elements (or **None**).
+    #
+    ##
+
+    texts = dict.fromkeys(selectors)
+
+    if not soup:
+        return texts
+
+    if isinstance(soup, str):
+        soup = ParseHTML(soup)
+
+    # Find the candidate elements: either all elements, or elements with given tag names.
+
+    subjectNames = {x: _GetSelectorSubjectNames(y) for x, y in selectors.items()}
+
+    isEveryElementNeeded = any((x is not None) and (len(x) > 1) for x in subjectNames.values())
+
+    allElements = [] if isEveryElementNeeded else None
+    elementsByName = {x: [] for names in subjectNames.values() if names for x in names}
+
+    for element in soup.descendants:
+        elementName = element.name
+        if elementName is None:
+            continue
+
+        if allElements is not None:
+            allElements.append(element)
+
+        elements = elementsByName.get(elementName)
+        if elements is not None:
+            elements.append(element)
+
+    # Match the selectors against the candidates.
+
+    for name, selector in selectors.items():
+        names = subjectNames[name]
+        compiledSelector = CompileSelector(selector)
+
+        # Matching every element one by one would be slower than a search.
+
+        if names is None:
+            element = compiledSelector.select_one(soup)
+            texts[name] = element.get_text().strip() if element else None
+            continue
+
+        if 1 == len(names):
+            candidates = elementsByName[next(iter(names))]
+        else:
+            candidates = [x for x in allElements if x.name in names]
+
+        for element in candidates:
+            if compiledSelector.match(element):
+                texts[name] = element.get_text().strip()
+                break
+
+    return texts
+
 def UnescapeHTMLEntities(code: str) -> str:
 
     ##
     #
-    # Unescapes HTML entities.
+    # Unescapes HTML entities. Names of entities are case-insensitive ("&NBSP;" is understood as
+    # "&nbsp;"), unless both forms are valid ("&Eacute;" and "&eacute;").
     #
     # @param code The input code.
     #
@@ -98,9 +314,541 @@ def UnescapeHTMLEntities(code: str) -> str:
     ##
 
     if not code:
-        return codde
+        return code
+
+    return _GetHTMLEntityTranslator(escape = False).Translate(code)
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Unescapes (see *UnescapeHTMLEntities*) or escapes (see *EscapeHTMLEntities*) HTML entities.
+# Entities are found and decoded in a single pass over the code. Can also process code split into
+# chunks.
+#
+##
+
+class HTMLEntityTranslator:
+
+    def __init__(self, escape: bool = False) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param escape Should the entities be escaped (instead of unescaped)?
+        #
+        ##
+
+        self._escape = escape
+
+    def Translate(self, code: str) -> str:
+
+        ##
+        #
+        # Translates HTML entities in code.
+        #
+        # @param code The input code.
+        #
+        # @return The processed code.
+        #
+        ##
+
+        if not code:
+            return code
+
+        code = HTML_ENTITY_EXPRESSION.sub(_UnescapeHTMLEntity, code)
+
+        # Escaping special characters one by one (in the same pass) would be slower than letting
+        # *html.escape* replace them.
+
+        return html.escape(code) if self._escape else code
+
+    def TranslateChunks(self, chunks: Iterable[str]) -> Iterator[str]:
+
+        ##
+        #
+        # Translates HTML entities in code split into chunks. Entities split between chunks are
+        # handled correctly.
+        #
+        # @param chunks The input code, in chunks.
+        #
+        # @return An iterator over the processed code, in chunks.
+        #
+        ##
+
+        pendingCode = ""
+
+        for chunk in chunks:
+            code = (pendingCode + chunk) if pendingCode else chunk
+
+            splitPosition = _GetHTMLEntitySafeSplitPosition(code)
+            pendingCode = code[splitPosition:]
+
+            if splitPosition:
+                yield self.Translate(code[:splitPosition])
+
+        if pendingCode:
+            yield self.Translate(pendingCode)
+
+##
+#
+# Limits parsing (see *ParseHTML*) to the subtrees which may contain elements matching given CSS
+# selectors. Only the tag names, the IDs and the classes of the first compound selectors are taken
+# into account, so the subtrees may contain more elements than necessary, but never less.
+#
+##
+
+class SelectorStrainer(ElementFilter):
+
+    def __init__(self, selectors: Iterable[str]) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param selectors CSS selectors (or tag names).
+        #
+        ##
+
+        super().__init__()
+
+        self._targets = []
+
+        for selector in selectors:
+            targets = _GetSelectorTargets(selector)
+
+            # Some selectors (like "h1 + p") may match elements anywhere in the document.
+
+            if targets is None:
+                self._targets = None
+                break
+
+            self._targets.extend(targets)
+
+    def IsRestrictive(self) -> bool:
+
+        ##
+        #
+        # Checks whether the strainer limits parsing at all.
+        #
+        # @return **True** if only some subtrees will be built, **False** otherwise.
+        #
+        ##
+
+        return self._targets is not None
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs) -> bool:
+
+        ##
+        #
+        # Checks whether a tag (and its subtree) should be built.
+        #
+        # @param nsprefix The namespace prefix of the tag.
+        # @param name     The name of the tag.
+        # @param attrs    The attributes of the tag.
+        #
+        # @return **True** if the tag should be built, **False** otherwise.
+        #
+        ##
+
+        if self._targets is None:
+            return True
+
+        attrs = attrs or {}
+        ID = attrs.get("id")
+
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+
+        for targetName, targetID, targetClasses in self._targets:
+            if (targetName is not None) and (targetName != name):
+                continue
+
+            if (targetID is not None) and (targetID != ID):
+                continue
+
+            if targetClasses and not targetClasses.issubset(classes):
+                continue
+
+            return True
+
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+
+        ##
+        #
+        # Checks whether a string outside of all the built subtrees should be kept.
+        #
+        # @param string The string.
+        #
+        # @return **True** if the string should be kept, **False** otherwise.
+        #
+        ##
+
+        return self._targets is None
+
+##
+#
+# Extracts text from HTML code, without building tag soup. The code can be provided in chunks (for
+# example, read from a file or downloaded piece by piece); the text is returned in lines as soon as
+# they are complete. Every line is returned as a tuple (text, is it the end of a paragraph?).
+# Paragraphs (including headers, list items etc.) end with their blocks, or with empty lines; lines
+# within them end with "<br>". Whitespace in every line is normalized. Only the current line is
+# kept in memory.
+#
+##
+
+class HTMLTextExtractor:
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        ##
+
+        self._parser = _HTMLTextParser()
+
+    def Close(self) -> List[Tuple[str, bool]]:
+
+        ##
+        #
+        # Processes the remaining code. The extractor shouldn't be fed afterwards.
+        #
+        # @return The remaining lines of text (see *Feed*).
+        #
+        ##
+
+        self._parser.close()
+        self._parser.EndLine(isParagraphEnd = True)
+
+        return self._parser.PopLines()
+
+    def Extract(self, source, encoding: str = "utf-8") -> Iterator[Tuple[str, bool]]:
+
+        ##
+        #
+        # Extracts text from HTML code, and closes the extractor.
+        #
+        # @param source   The code: a string, bytes, a file-like object, or an iterable of chunks
+        #                 (see *Text.StringifyChunks*).
+        # @param encoding The text encoding of the code (if given in bytes).
+        #
+        # @return An iterator over the lines of text (see *Feed*).
+        #
+        ##
+
+        for code in StringifyChunks(source, encoding):
+            yield from self.Feed(code)
+
+        yield from self.Close()
+
+    def Feed(self, code: str) -> List[Tuple[str, bool]]:
+
+        ##
+        #
+        # Processes a chunk of code.
+        #
+        # @param code The chunk of code.
+        #
+        # @return The lines of text completed in this chunk: tuples (text, is it the end of a
+        #         paragraph?).
+        #
+        ##
+
+        self._parser.feed(code)
+
+        return self._parser.PopLines()
+
+##
+#
+# The HTML parser used by *HTMLTextExtractor*.
+#
+##
+
+class _HTMLTextParser(HTMLParser):
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        ##
+
+        super().__init__(convert_charrefs = True)
+
+        self._lines = []
+        self._pieces = []
+        self._pendingLine = None
+        self._ignoredDepth = 0
+
+    def EndLine(self, isParagraphEnd: bool) -> None:
+
+        ##
+        #
+        # Finishes the current line of text. A line ended with "<br>" is kept pending until it's
+        # known whether the paragraph continues.
+        #
+        # @param isParagraphEnd Does the paragraph end here (with a block)?
+        #
+        ##
+
+        line = TEXT_WHITESPACE_EXPRESSION.sub(" ", "".join(self._pieces)).strip()
+        self._pieces = []
+
+        if line:
+            if self._pendingLine is not None:
+                self._lines.append((self._pendingLine, False))
+
+            self._pendingLine = line
+
+        # An empty line (e.g. "<br><br>") ends the paragraph as well.
+
+        if (self._pendingLine is not None) and (isParagraphEnd or not line):
+            self._lines.append((self._pendingLine, True))
+            self._pendingLine = None
+
+    def PopLines(self) -> List[Tuple[str, bool]]:
+
+        ##
+        #
+        # Retrieves the completed lines of text.
+        #
+        # @return The lines of text completed since the last call.
+        #
+        ##
+
+        lines = self._lines
+        self._lines = []
+
+        return lines
+
+    def handle_data(self, data: str) -> None:
+
+        ##
+        #
+        # Handles text.
+        #
+        # @param data The text.
+        #
+        ##
+
+        if not self._ignoredDepth:
+            self._pieces.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+
+        ##
+        #
+        # Handles an end tag.
+        #
+        # @param tag The name of the tag.
+        #
+        ##
+
+        if tag in IGNORED_TEXT_TAGS:
+            self._ignoredDepth = max(0, self._ignoredDepth - 1)
+
+        elif tag in BLOCK_TAGS:
+            self.EndLine(isParagraphEnd = True)
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+
+        ##
+        #
+        # Handles a self-closing tag.
+        #
+        # @param tag   The name of the tag.
+        # @param attrs The attributes of the tag.
+        #
+        ##
+
+        if tag in BLOCK_TAGS:
+            self.EndLine(isParagraphEnd = True)
+
+        elif "br" == tag:
+            self.EndLine(isParagraphEnd = False)
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+
+        ##
+        #
+        # Handles a start tag.
+        #
+        # @param tag   The name of the tag.
+        # @param attrs The attributes of the tag.
+        #
+        ##
+
+        if tag in IGNORED_TEXT_TAGS:
+            self._ignoredDepth += 1
+
+        else:
+            self.handle_startendtag(tag, attrs)
+
+#
+#
+#
+# Private functions.
+#
+#
+#
+
+def _GetHTMLEntitySafeSplitPosition(code: str) -> int:
+
+    ##
+    #
+    # Finds the position at which code can be split without splitting any entity.
+    #
+    # @param code The code.
+    #
+    # @return The split position; all the code following it may belong to an unfinished entity.
+    #
+    ##
+
+    position = code.rfind("&")
+    if -1 == position:
+        return len(code)
+
+    match = HTML_ENTITY_EXPRESSION.match(code, position)
+    if match:
+        return position if (match.end() == len(code)) else len(code)
+
+    return position if (code[position:] in INCOMPLETE_HTML_ENTITIES) else len(code)
+
+@lru_cache(maxsize = None)
+def _GetHTMLEntityTranslator(escape: bool) -> HTMLEntityTranslator:
+
+    ##
+    #
+    # Returns the entity translator used by *EscapeHTMLEntities* or *UnescapeHTMLEntities*,
+    # creating it when first needed.
+    #
+    # @param escape Should the entities be escaped (instead of unescaped)?
+    #
+    # @return The entity translator.
+    #
+    ##
+
+    return HTMLEntityTranslator(escape)
+
+@lru_cache(maxsize = SELECTOR_CACHE_SIZE)
+def _GetSelectorSubjectNames(selector: str) -> Optional[FrozenSet[str]]:
+
+    ##
+    #
+    # Finds the tag names of the elements which may match given CSS selector, i.e. the tag names of
+    # its last compound selectors.
+    #
+    # @param selector The CSS selector (or the tag name).
+    #
+    # @return The tag names; or **None**, if elements with any name may match the selector.
+    #
+    ##
+
+    names = set()
+
+    for complexSelector in SELECTOR_IGNORED_PARTS_EXPRESSION.sub("", selector).split(","):
+        compoundSelector = SELECTOR_COMBINATOR_EXPRESSION.split(complexSelector.strip())[-1]
+
+        name = SELECTOR_COMPOUND_EXPRESSION.match(compoundSelector).group(1)
+        if (not name) or ("*" == name):
+            return None
+
+        names.add(name.lower())
+
+    return frozenset(names)
+
+def _GetSelectorTargets(
+    selector: str
+) -> Optional[List[Tuple[Optional[str], Optional[str], FrozenSet[str]]]]:
+
+    ##
+    #
+    # Describes the elements which may contain the elements matching given CSS selector (see
+    # *SelectorStrainer*).
+    #
+    # @param selector The CSS selector (or the tag name).
+    #
+    # @return A list of tuples (tag name, ID, classes), one for each selector in the group. Missing
+    #         parts are **None** (or empty). **None** is returned if the elements may be anywhere.
+    #
+    ##
+
+    selector = SELECTOR_IGNORED_PARTS_EXPRESSION.sub(_ReplaceIgnoredSelectorPart, selector)
+
+    if ("+" in selector) or ("~" in selector):
+        return None
+
+    targets = []
+
+    for complexSelector in selector.split(","):
+
+        # Structural pseudo-classes in the first compound selector depend on the elements which
+        # won't be built.
+
+        compoundSelector = SELECTOR_COMBINATOR_EXPRESSION.split(complexSelector.strip())[0]
+
+        if SELECTOR_STRUCTURAL_PSEUDO_CLASS_EXPRESSION.search(compoundSelector):
+            return None
+
+        match = SELECTOR_COMPOUND_EXPRESSION.match(compoundSelector)
+
+        name, suffixes = match.groups()
+        name = name.lower() if (name and ("*" != name)) else None
+
+        IDs = re.findall("#([\\w-]+)", suffixes)
+        classes = frozenset(re.findall("\\.([\\w-]+)", suffixes))
+
+        targets.append((name, IDs[0] if IDs else None, classes))
+
+    return targets
+
+def _ReplaceIgnoredSelectorPart(match: re.Match) -> str:
+
+    ##
+    #
+    # Removes an ignored part of a CSS selector (see *SELECTOR_IGNORED_PARTS_EXPRESSION*), keeping
+    # a trace of the structural pseudo-classes it contains (e.g. in "p:not(:first-child)").
+    #
+    # @param match The ignored part.
+    #
+    # @return An empty string, or a structural pseudo-class.
+    #
+    ##
+
+    return ":root" if SELECTOR_STRUCTURAL_PSEUDO_CLASS_EXPRESSION.search(match.group()) else ""
+
+def _UnescapeHTMLEntity(match: re.Match) -> str:
+
+    ##
+    #
+    # Unescapes a single entity (see *UnescapeHTMLEntities*).
+    #
+    # @param match The entity.
+    #
+    # @return The unescaped entity.
+    #
+    ##
+
+    name = match.group(1)
+
+    if "#" != name[0]:
+        text = HTML5_ENTITIES.get(name) or HTML5_ENTITIES.get(name.lower())
+        if text is not None:
+            return text
 
-    for entity in re.findall("&[a-z]+?;", code):
-        code = code.replace(entity, entity.lower())
+    # Numeric references, and names with valid prefixes ("&ampx").
 
-    return html.unescape(code)
\ No newline at end of file
+    return html.unescape(match.group(0))
\ No newline at end of file
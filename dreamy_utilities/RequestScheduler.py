@@ -0,0 +1,280 @@
+####
+#
+# Dreamy Utilities
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from dreamy_utilities.Web import GetHostname, ParseRetryAfter
+
+# Standard packages.
+
+import threading
+from time import monotonic
+from typing import Optional
+
+#
+#
+#
+# Constants.
+#
+#
+#
+
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_BURST_SIZE = 4
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+DEFAULT_INITIAL_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 300.0
+
+# Status codes meaning that the host is overloaded, or that we're sending too many requests.
+
+BACKOFF_STATUS_CODES = frozenset([429, 503])
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Schedules requests sent to many hosts (see *Web.GetHostname*). Every host has its own token bucket
+# (limiting the rate of requests), its own limit of concurrent requests, and its own backoff delay,
+# increased whenever the host responds with 429 or 503 (or sends the "Retry-After" header). The
+# scheduler is thread-safe, and requests to different hosts never wait for each other.
+#
+##
+
+class RequestScheduler:
+
+    def __init__(
+        self,
+        requestsPerSecond: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        burstSize: int = DEFAULT_BURST_SIZE,
+        maxConcurrentRequests: Optional[int] = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        initialBackoff: float = DEFAULT_INITIAL_BACKOFF,
+        maxBackoff: float = DEFAULT_MAX_BACKOFF
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param requestsPerSecond     The rate at which the tokens are refilled, per host. **None**
+        #                              disables the rate limit; otherwise, it has to be positive.
+        # @param burstSize             The capacity of every token bucket (the number of requests
+        #                              which can be sent at once to an idle host).
+        # @param maxConcurrentRequests The maximum number of requests in flight, per host (at least
+        #                              one). **None** disables the limit.
+        # @param initialBackoff        The delay (in seconds) after the first 429/503 response.
+        #                              Doubled after every subsequent one; reset by a successful
+        #                              response.
+        # @param maxBackoff            The maximum delay (in seconds) after a 429/503 response, also
+        #                              applied to the "Retry-After" header.
+        #
+        ##
+
+        if (requestsPerSecond is not None) and (requestsPerSecond <= 0):
+            raise ValueError(f"Invalid number of requests per second: {requestsPerSecond}.")
+
+        if (maxConcurrentRequests is not None) and (maxConcurrentRequests < 1):
+            raise ValueError(f"Invalid number of concurrent requests: {maxConcurrentRequests}.")
+
+        self._requestsPerSecond = requestsPerSecond
+        self._burstSize = max(1, burstSize)
+        self._maxConcurrentRequests = maxConcurrentRequests
+        self._initialBackoff = initialBackoff
+        self._maxBackoff = maxBackoff
+
+        self._hosts = {}
+        self._condition = threading.Condition()
+
+    def Acquire(self, URL: str) -> None:
+
+        ##
+        #
+        # Waits until a request can be sent to given URL, and reserves a slot for it. Every call has
+        # to be followed by a call to *Release*.
+        #
+        # @param URL The URL.
+        #
+        ##
+
+        hostname = GetHostname(URL) or ""
+
+        with self._condition:
+            host = self._GetHost(hostname)
+
+            while True:
+                waitingTime = self._GetWaitingTime(host)
+                if 0 == waitingTime:
+                    break
+
+                self._condition.wait(waitingTime)
+
+            if self._requestsPerSecond is not None:
+                host.tokens -= 1
+
+            host.requestsInFlight += 1
+
+    def GetDelay(self, URL: str) -> float:
+
+        ##
+        #
+        # Returns the remaining backoff delay of the host of given URL.
+        #
+        # @param URL The URL.
+        #
+        # @return The delay, in seconds (zero if requests can be sent).
+        #
+        ##
+
+        with self._condition:
+            host = self._hosts.get(GetHostname(URL) or "")
+
+            return max(0.0, host.blockedUntil - monotonic()) if host else 0.0
+
+    def Release(
+        self,
+        URL: str,
+        statusCode: Optional[int] = None,
+        retryAfter: Optional[str] = None
+    ) -> None:
+
+        ##
+        #
+        # Frees the slot reserved by *Acquire*, and adapts the backoff delay of the host to the
+        # response.
+        #
+        # @param URL        The URL.
+        # @param statusCode The status code of the response. Optional (e.g. if the request failed).
+        # @param retryAfter The value of the "Retry-After" header of the response. Optional.
+        #
+        ##
+
+        hostname = GetHostname(URL) or ""
+
+        with self._condition:
+            host = self._GetHost(hostname)
+            host.requestsInFlight = max(0, host.requestsInFlight - 1)
+
+            delay = ParseRetryAfter(retryAfter)
+
+            if statusCode in BACKOFF_STATUS_CODES:
+                host.backoff = min(self._maxBackoff, max(self._initialBackoff, 2 * host.backoff))
+                delay = max(delay or 0.0, host.backoff)
+
+            elif (statusCode is not None) and (statusCode < 500):
+                host.backoff = 0.0
+
+            if delay:
+                blockedUntil = monotonic() + min(delay, self._maxBackoff)
+                host.blockedUntil = max(host.blockedUntil, blockedUntil)
+
+            self._condition.notify_all()
+
+    def _GetHost(self, hostname: str) -> "_HostState":
+
+        ##
+        #
+        # Returns the state of given host, creating it when first needed.
+        #
+        # @param hostname The hostname.
+        #
+        # @return The state of the host.
+        #
+        ##
+
+        host = self._hosts.get(hostname)
+
+        if host is None:
+            host = self._hosts[hostname] = _HostState(self._burstSize)
+
+        return host
+
+    def _GetWaitingTime(self, host: "_HostState") -> Optional[float]:
+
+        ##
+        #
+        # Calculates how long a new request to given host has to wait. Refills the token bucket.
+        #
+        # @param host The state of the host.
+        #
+        # @return The waiting time, in seconds; **None** if the request has to wait for another one
+        #         to finish; zero if the request can be sent.
+        #
+        ##
+
+        now = monotonic()
+
+        if self._requestsPerSecond is not None:
+            host.tokens = min(
+                self._burstSize,
+                host.tokens + (now - host.refilledAt) * self._requestsPerSecond
+            )
+
+            host.refilledAt = now
+
+        if (self._maxConcurrentRequests is not None) and (
+            host.requestsInFlight >= self._maxConcurrentRequests
+        ):
+            return None
+
+        if host.blockedUntil > now:
+            return host.blockedUntil - now
+
+        if (self._requestsPerSecond is not None) and (host.tokens < 1):
+            return (1 - host.tokens) / self._requestsPerSecond
+
+        return 0
+
+##
+#
+# The state of a single host (see *RequestScheduler*).
+#
+##
+
+class _HostState:
+
+    def __init__(self, tokens: float) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param tokens The initial number of tokens.
+        #
+        ##
+
+        self.tokens = tokens
+        self.refilledAt = monotonic()
+        self.requestsInFlight = 0
+        self.blockedUntil = 0.0
+        self.backoff = 0.0
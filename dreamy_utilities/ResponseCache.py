@@ -0,0 +1,397 @@
+####
+#
+# Dreamy Utilities
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from pathlib import Path
+import sqlite3
+import threading
+from time import time
+from typing import Dict, Optional, Union
+
+#
+#
+#
+# Constants.
+#
+#
+#
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_TIME_TO_LIVE = 0.0
+
+# The contents are stored last, so that reading the other columns doesn't require reading the
+# (possibly large) contents. The index covers both computing the total size and finding the least
+# recently used responses.
+
+CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS Responses (
+        URL TEXT PRIMARY KEY,
+        Size INTEGER NOT NULL,
+        ETag TEXT,
+        LastModified TEXT,
+        StoredAt REAL NOT NULL,
+        AccessedAt REAL NOT NULL,
+        Content BLOB NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS ResponsesByAccessTime ON Responses (AccessedAt, Size, URL);
+"""
+
+# The number of least recently used entries removed at once, when the cache is full.
+
+EVICTION_BATCH_SIZE = 16
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# An on-disk cache of HTTP responses (see *WebSession*), stored in an SQLite database. The size of
+# the cache is bounded: the least recently used responses are evicted first. Responses younger than
+# the time-to-live are served without contacting the server; older ones are revalidated using
+# conditional requests ("If-None-Match" and "If-Modified-Since"). The cache is thread-safe, and can
+# be shared between sessions (and processes, using the same database file).
+#
+##
+
+class ResponseCache:
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        maxSize: int = DEFAULT_MAX_SIZE,
+        timeToLive: float = DEFAULT_TIME_TO_LIVE
+    ) -> None:
+
+        ##
+        #
+        # The constructor. Opens (or creates) the database.
+        #
+        # @param path       The path to the database file (":memory:" keeps the cache in memory).
+        # @param maxSize    The maximum total size of the cached contents, in bytes.
+        # @param timeToLive The time (in seconds) during which cached responses are considered
+        #                   fresh. By default, every response is revalidated.
+        #
+        ##
+
+        self._maxSize = maxSize
+        self._timeToLive = timeToLive
+
+        self._lock = threading.Lock()
+
+        # Write transactions take the lock immediately, so that the total size can't change
+        # between computing it and evicting the responses (see *Store*).
+
+        self._connection = sqlite3.connect(
+            str(path),
+            isolation_level = "IMMEDIATE",
+            check_same_thread = False
+        )
+
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(CACHE_SCHEMA)
+
+    def __enter__(self) -> "ResponseCache":
+
+        ##
+        #
+        # Enters the context.
+        #
+        # @return The cache.
+        #
+        ##
+
+        return self
+
+    def __exit__(self, *arguments) -> None:
+
+        ##
+        #
+        # Exits the context, closing the database.
+        #
+        ##
+
+        self.Close()
+
+    def Clear(self) -> None:
+
+        ##
+        #
+        # Removes all the cached responses.
+        #
+        ##
+
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM Responses")
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Closes the database.
+        #
+        ##
+
+        with self._lock:
+            self._connection.close()
+
+    def Get(self, URL: str) -> Optional["CachedResponse"]:
+
+        ##
+        #
+        # Retrieves a cached response, marking it as recently used.
+        #
+        # @param URL The URL.
+        #
+        # @return The cached response, or **None**.
+        #
+        ##
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT Content, ETag, LastModified, StoredAt FROM Responses WHERE URL = ?",
+                (URL,)
+            ).fetchone()
+
+            if not row:
+                return None
+
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE Responses SET AccessedAt = ? WHERE URL = ?",
+                    (time(), URL)
+                )
+
+        content, ETag, lastModified, storedAt = row
+
+        return CachedResponse(
+            bytes(content),
+            ETag,
+            lastModified,
+            (time() - storedAt) < self._timeToLive
+        )
+
+    def GetSize(self) -> int:
+
+        ##
+        #
+        # Returns the total size of the cached contents (including the responses stored by other
+        # instances using the same database).
+        #
+        # @return The size, in bytes.
+        #
+        ##
+
+        with self._lock:
+            return self._GetTotalSize()
+
+    def Refresh(self, URL: str) -> None:
+
+        ##
+        #
+        # Marks a cached response as fresh (e.g. after the server has confirmed that it hasn't
+        # changed).
+        #
+        # @param URL The URL.
+        #
+        ##
+
+        with self._lock:
+            with self._connection:
+                now = time()
+
+                self._connection.execute(
+                    "UPDATE Responses SET StoredAt = ?, AccessedAt = ? WHERE URL = ?",
+                    (now, now, URL)
+                )
+
+    def Remove(self, URL: str) -> None:
+
+        ##
+        #
+        # Removes a cached response.
+        #
+        # @param URL The URL.
+        #
+        ##
+
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM Responses WHERE URL = ?", (URL,))
+
+    def Store(
+        self,
+        URL: str,
+        content: bytes,
+        ETag: Optional[str] = None,
+        lastModified: Optional[str] = None
+    ) -> bool:
+
+        ##
+        #
+        # Stores a response, evicting the least recently used ones if the cache is full. Responses
+        # which can't be revalidated (having neither an ETag nor a modification date) are stored only
+        # if they can be served fresh (i.e. the time-to-live isn't zero).
+        #
+        # @param URL          The URL.
+        # @param content      The content of the response.
+        # @param ETag         The value of the "ETag" header of the response. Optional.
+        # @param lastModified The value of the "Last-Modified" header of the response. Optional.
+        #
+        # @return **True** if the response has been stored, **False** if it's too large (or couldn't
+        #         ever be reused).
+        #
+        ##
+
+        isReusable = (self._timeToLive > 0) or ETag or lastModified
+
+        if (not isReusable) or (len(content) > self._maxSize):
+            self.Remove(URL)
+            return False
+
+        with self._lock:
+            with self._connection:
+                now = time()
+
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO Responses "
+                    "(URL, Size, ETag, LastModified, StoredAt, AccessedAt, Content) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (URL, len(content), ETag, lastModified, now, now, sqlite3.Binary(content))
+                )
+
+                self._EvictEntries()
+
+        return True
+
+    def _EvictEntries(self) -> None:
+
+        ##
+        #
+        # Removes the least recently used responses, until the cache fits within its size limit.
+        # Has to be called with the lock held, within a write transaction.
+        #
+        ##
+
+        excessSize = self._GetTotalSize() - self._maxSize
+
+        while excessSize > 0:
+            rows = self._connection.execute(
+                "SELECT URL, Size FROM Responses ORDER BY AccessedAt LIMIT ?",
+                (EVICTION_BATCH_SIZE,)
+            ).fetchall()
+
+            if not rows:
+                break
+
+            # Remove only as many entries as needed.
+
+            evictedURLs = []
+
+            for URL, size in rows:
+                if excessSize <= 0:
+                    break
+
+                evictedURLs.append((URL,))
+                excessSize -= size
+
+            self._connection.executemany("DELETE FROM Responses WHERE URL = ?", evictedURLs)
+
+    def _GetTotalSize(self) -> int:
+
+        ##
+        #
+        # Computes the total size of the cached contents. Has to be called with the lock held.
+        #
+        # @return The size, in bytes.
+        #
+        ##
+
+        return self._connection.execute(
+            "SELECT COALESCE(SUM(Size), 0) FROM Responses"
+        ).fetchone()[0]
+
+##
+#
+# A cached response (see *ResponseCache*).
+#
+##
+
+class CachedResponse:
+
+    def __init__(
+        self,
+        content: bytes,
+        ETag: Optional[str],
+        lastModified: Optional[str],
+        isFresh: bool
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param content      The content of the response.
+        # @param ETag         The value of the "ETag" header of the response, or **None**.
+        # @param lastModified The value of the "Last-Modified" header of the response, or **None**.
+        # @param isFresh      Can the response be used without revalidating it?
+        #
+        ##
+
+        self.content = content
+        self.ETag = ETag
+        self.lastModified = lastModified
+        self.isFresh = isFresh
+
+    def GetValidationHeaders(self) -> Dict[str, str]:
+
+        ##
+        #
+        # Returns the headers of a conditional request revalidating the response.
+        #
+        # @return The headers (empty if the response can't be revalidated).
+        #
+        ##
+
+        headers = {}
+
+        if self.ETag:
+            headers["If-None-Match"] = self.ETag
+
+        if self.lastModified:
+            headers["If-Modified-Since"] = self.lastModified
+
+        return headers
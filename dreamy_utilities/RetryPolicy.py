@@ -0,0 +1,194 @@
+####
+#
+# Dreamy Utilities
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+import random
+from requests.exceptions import ConnectionError, Timeout
+from typing import Iterable, Optional, Tuple, Type
+
+#
+#
+#
+# Constants.
+#
+#
+#
+
+DEFAULT_RETRY_STATUS_CODES = frozenset([408, 429, 500, 502, 503, 504])
+DEFAULT_RETRY_EXCEPTION_TYPES = (ConnectionError, Timeout)
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_INITIAL_DELAY = 0.5
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_MAX_RETRY_AFTER = 300.0
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Decides whether (and when) failed requests should be retried. Delays grow exponentially, with
+# "full jitter": the actual delay is chosen at random, between zero and the exponential delay.
+#
+##
+
+class RetryPolicy:
+
+    def __init__(
+        self,
+        statusCodes: Iterable[int] = DEFAULT_RETRY_STATUS_CODES,
+        exceptionTypes: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTION_TYPES,
+        maxAttempts: int = DEFAULT_MAX_ATTEMPTS,
+        initialDelay: float = DEFAULT_INITIAL_DELAY,
+        maxDelay: float = DEFAULT_MAX_DELAY,
+        backoffFactor: float = DEFAULT_BACKOFF_FACTOR,
+        jitter: bool = True,
+        deadline: Optional[float] = None,
+        maxRetryAfter: Optional[float] = DEFAULT_MAX_RETRY_AFTER
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param statusCodes    The status codes of the responses which should be retried.
+        # @param exceptionTypes The types of the exceptions which should be retried.
+        # @param maxAttempts    The maximum number of attempts (including the first one).
+        # @param initialDelay   The delay (in seconds) before the first retry.
+        # @param maxDelay       The maximum delay (in seconds) of the exponential backoff.
+        # @param backoffFactor  The factor by which the delay grows after every retry.
+        # @param jitter         Should the delays be randomized?
+        # @param deadline       The maximum total time (in seconds) spent on a request, including
+        #                       all the retries. Optional.
+        # @param maxRetryAfter  The longest delay (in seconds) requested by the server (using the
+        #                       "Retry-After" header) which is honoured. If the server asks to wait
+        #                       longer, the request isn't retried. **None** disables the limit.
+        #
+        ##
+
+        self._statusCodes = frozenset(statusCodes)
+        self._exceptionTypes = tuple(exceptionTypes)
+        self._maxAttempts = max(1, maxAttempts)
+        self._initialDelay = initialDelay
+        self._maxDelay = maxDelay
+        self._backoffFactor = backoffFactor
+        self._jitter = jitter
+        self._deadline = deadline
+        self._maxRetryAfter = maxRetryAfter
+
+    def GetDelay(self, attempt: int, retryAfter: Optional[float] = None) -> Optional[float]:
+
+        ##
+        #
+        # Calculates the delay before the next attempt. The delay requested by the server is never
+        # shortened (retrying earlier would only get the request throttled again).
+        #
+        # @param attempt    The number of the failed attempt (starting from 1).
+        # @param retryAfter The delay requested by the server (see *Web.ParseRetryAfter*). Optional.
+        #
+        # @return The delay, in seconds; **None** if the server asks to wait longer than allowed.
+        #
+        ##
+
+        if (
+            (retryAfter is not None) and
+            (self._maxRetryAfter is not None) and
+            (retryAfter > self._maxRetryAfter)
+        ):
+            return None
+
+        delay = min(self._maxDelay, self._initialDelay * self._backoffFactor ** (attempt - 1))
+
+        if self._jitter:
+            delay = random.uniform(0, delay)
+
+        if retryAfter is not None:
+            delay = max(delay, retryAfter)
+
+        return delay
+
+    def IsRetryable(
+        self,
+        statusCode: Optional[int] = None,
+        exception: Optional[BaseException] = None
+    ) -> bool:
+
+        ##
+        #
+        # Checks whether a failed attempt may be retried.
+        #
+        # @param statusCode The status code of the response. Optional.
+        # @param exception  The exception raised during the attempt. Optional.
+        #
+        # @return **True** if the attempt may be retried, **False** otherwise.
+        #
+        ##
+
+        if exception is not None:
+            return isinstance(exception, self._exceptionTypes)
+
+        return statusCode in self._statusCodes
+
+    def ShouldRetry(
+        self,
+        attempt: int,
+        elapsedTime: float,
+        delay: Optional[float],
+        statusCode: Optional[int] = None,
+        exception: Optional[BaseException] = None
+    ) -> bool:
+
+        ##
+        #
+        # Checks whether a failed attempt should be retried, taking the limits into account.
+        #
+        # @param attempt     The number of the failed attempt (starting from 1).
+        # @param elapsedTime The time (in seconds) spent on the request so far.
+        # @param delay       The delay before the next attempt (see *GetDelay*); **None** means that
+        #                    the request shouldn't be retried.
+        # @param statusCode  The status code of the response. Optional.
+        # @param exception   The exception raised during the attempt. Optional.
+        #
+        # @return **True** if the attempt should be retried, **False** otherwise.
+        #
+        ##
+
+        if (attempt >= self._maxAttempts) or (delay is None):
+            return False
+
+        if (self._deadline is not None) and (elapsedTime + delay > self._deadline):
+            return False
+
+        return self.IsRetryable(statusCode, exception)
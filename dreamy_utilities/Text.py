@@ -28,14 +28,27 @@
 
 # Standard packages.
 
+import bisect
+import codecs
+import mmap
+from numbers import Integral
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+import pickle
 import re
-from typing import Any, List, Optional, Tuple
+import unicodedata
+from string import ascii_letters
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
 
 # Non-standard packages.
 
-from babel.dates import format_date
-from babel.numbers import format_decimal
+from babel import Locale
+from babel.dates import get_date_format
+from babel.dates import parse_pattern as parse_date_pattern
+from babel.numbers import parse_pattern as parse_number_pattern
+import numpy
 from titlecase import titlecase
 
 #
@@ -46,16 +59,112 @@ from titlecase import titlecase
 #
 #
 
-VALID_ROMAN_NUMERAL_CHARACTERS = [
-    "I",
-    "V",
-    "X",
-    "L",
-    "C",
-    "D",
-    "M",
+TITLE_PREFIXES = [
+    "Chapter \\d+",
+    "Ch\\. \\d+",
+    "Update \\d+",
+    "Part \\d+",
 ]
 
+TITLE_POSTFIXES = [
+    "Finale",
+    "Final Part",
+    "Final Update",
+    "Final",
+    "Chapter \\d+",
+    "Ch\\. \\d+",
+    "Update \\d+",
+    "Part \\d+",
+]
+
+TITLE_CACHE_SIZE = 4096
+
+# Matches the separators between titles and subtitles: numbers followed by dots ("1."), dashes
+# surrounded by whitespace, and colons.
+
+SUBTITLE_SEPARATOR_EXPRESSION = re.compile("\\d+\\.+:*|\\s+-\\s+|:")
+SUBTITLE_NUMBER_EXPRESSION = re.compile("\\d+\\.+:*")
+SUBTITLE_DASH_EXPRESSION = re.compile("\\s+-\\s+")
+
+TITLECASE_SMALL_WORDS = frozenset([
+    "a", "an", "and", "as", "at", "but", "by", "en", "for", "if", "in", "of", "on", "or", "the",
+    "to", "v", "via", "vs",
+])
+
+TITLECASE_HONORIFICS = frozenset(["dr", "mr", "mrs", "ms"])
+TITLECASE_CONSONANTS = "bcdfghjklmnpqrstvwxzBCDFGHJKLMNPQRSTVWXZ"
+TITLECASE_SUBPHRASE_PUNCTUATION = frozenset(":.;?!-")
+TITLECASE_WORD_EXPRESSION = re.compile("([(\\[\"']?)([A-Za-z0-9]+)([,.:;!?)\\]\"']?)")
+
+EXPRESSION_CACHE_SIZE = 512
+
+FORMATTER_CACHE_SIZE = 4096
+
+MULTIMATCHER_EXCLUDED_EXPRESSION = re.compile("\\\\[1-9]|\\(\\?P[<=]|\\(\\?\\(")
+
+TEMPLATE_VARIABLE_EXPRESSION = re.compile("@@@([^@\\s]+)@@@")
+TEMPLATE_CACHE_SIZE = 64
+
+STRINGIFY_CHUNK_SIZE = 65536
+
+# Plain numbers (see *DeprettifyNumbers*) of up to 18 digits always fit in 64-bit integers.
+
+MAXIMUM_PLAIN_NUMBER_LENGTH = 18
+
+# Legacy encodings (canonical codec names) representing ASCII characters the same way ASCII does, so
+# that pure ASCII input may be decoded using the (faster) ASCII codec. The UTF-8 and ASCII decoders
+# are fast enough on their own; checking the input first would only slow them down. Stateful
+# encodings (like "iso2022_jp" or "utf-7") use plain ASCII bytes for escape sequences, and can't be
+# listed here.
+
+LEGACY_ASCII_COMPATIBLE_ENCODINGS = frozenset([
+    "iso8859-1", "iso8859-2", "iso8859-3", "iso8859-4", "iso8859-5", "iso8859-6", "iso8859-7",
+    "iso8859-8", "iso8859-9", "iso8859-10", "iso8859-11", "iso8859-13", "iso8859-14", "iso8859-15",
+    "iso8859-16",
+    "cp1250", "cp1251", "cp1252", "cp1253", "cp1254", "cp1255", "cp1256", "cp1257", "cp1258",
+    "cp437", "cp850", "cp852", "cp866", "koi8-r", "koi8-u", "mac-roman",
+    "big5", "cp932", "cp949", "euc_jp", "euc_kr", "gb18030", "gbk", "shift_jis",
+])
+
+# Types decoded directly by *Stringify* (and copied by *Bytify*). Other objects supporting the
+# buffer protocol (e.g. NumPy scalars and arrays) are converted to strings using *str*.
+
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+TRUNCATION_MEASURES = [
+    "characters",
+    "graphemes",
+    "width",
+]
+
+# The ranges of code points for which the character tables are built; every other code point is
+# unassigned, or belongs to a private use area.
+
+CHARACTER_TABLE_RANGES = [
+    (0x00000, 0x40000),
+    (0xE0000, 0xE1000),
+]
+
+ZERO_WIDTH_JOINER = 0x200D
+
+ROMAN_NUMERAL_VALUES = [
+    (1000, "M"),
+    (900, "CM"),
+    (500, "D"),
+    (400, "CD"),
+    (100, "C"),
+    (90, "XC"),
+    (50, "L"),
+    (40, "XL"),
+    (10, "X"),
+    (9, "IX"),
+    (5, "V"),
+    (4, "IV"),
+    (1, "I"),
+]
+
+MAXIMUM_ROMAN_NUMERAL = 3999
+
 #
 #
 #
@@ -68,7 +177,8 @@ def Bytify(value: Any) -> bytes:
 
     ##
     #
-    # Converts any value to bytes.
+    # Converts any value to bytes. Buffers (*bytearray*, *memoryview* and *mmap* objects) are copied
+    # into a *bytes* object.
     #
     # @param value The data to be bytified.
     #
@@ -82,9 +192,31 @@ def Bytify(value: Any) -> bytes:
     elif isinstance(value, bytes):
         return value
 
+    elif isinstance(value, str):
+        return value.encode("utf-8")
+
+    elif _IsBuffer(value):
+        return bytes(value)
+
     else:
         return bytes(value, encoding = "utf-8")
 
+@lru_cache(maxsize = EXPRESSION_CACHE_SIZE)
+def CompileExpression(expression: str) -> re.Pattern:
+
+    ##
+    #
+    # Compiles a regular expression, caching the result. The statistics of the cache can be read
+    # using *CompileExpression.cache_info()*.
+    #
+    # @param expression The regular expression.
+    #
+    # @return The compiled expression.
+    #
+    ##
+
+    return re.compile(expression)
+
 def DeprettifyAmount(amount: str) -> Tuple[int, int]:
 
     ##
@@ -141,6 +273,91 @@ def DeprettifyNumber(number: str) -> int:
 
     return number
 
+def DeprettifyAmounts(amounts: Union[Iterable[str], numpy.ndarray]) -> numpy.ndarray:
+
+    ##
+    #
+    # Converts multiple "amounts" to integers (see *DeprettifyAmount*).
+    #
+    # @param amounts The textual amounts (a sequence of strings, or an array).
+    #
+    # @return An array of shape (N, 2), containing the integers.
+    #
+    ##
+
+    amounts = _GetStringArray(amounts)
+
+    if not len(amounts):
+        return numpy.zeros((0, 2), dtype = numpy.int64)
+
+    # Partitioning yields an array of shape (N, 3): (first part, separator, remainder).
+
+    parts = numpy.char.partition(amounts, "/").reshape(-1, 3)
+    secondParts = numpy.char.partition(parts[:, 2], "/").reshape(-1, 3)[:, 0]
+
+    results = numpy.stack(
+        [DeprettifyNumbers(parts[:, 0]), DeprettifyNumbers(secondParts)],
+        axis = 1
+    )
+    results[parts[:, 1] == ""] = 0
+
+    return results
+
+def DeprettifyNumbers(numbers: Union[Iterable[str], numpy.ndarray]) -> numpy.ndarray:
+
+    ##
+    #
+    # Converts multiple "pretty" numbers to integers (see *DeprettifyNumber*). Plain numbers (made
+    # of up to 18 ASCII digits, and commas) are converted all at once; anything more unusual is
+    # converted one by one.
+    #
+    # @param numbers The input numbers (a sequence of strings, or an array).
+    #
+    # @return An array of integers.
+    #
+    ##
+
+    numbers = numbers.ravel().tolist() if isinstance(numbers, numpy.ndarray) else list(numbers)
+
+    if not numbers:
+        return numpy.zeros(0, dtype = numpy.int64)
+
+    # Look at all the numbers as a single string, one number per line (unless some of them contain
+    # line breaks). Every line starts with a zero, so that empty ones are valid numbers too. Values
+    # which aren't strings are converted only if there are any.
+
+    try:
+        text = "0" + "\n0".join(numbers)
+
+    except TypeError:
+        numbers = _GetStringList(numbers)
+        text = "0" + "\n0".join(numbers)
+
+    if text.count("\n") == len(numbers) - 1:
+        results, isPlain = _DeprettifyPlainNumbers(text.replace(",", ""))
+
+    else:
+        results = numpy.zeros(len(numbers), dtype = numpy.int64)
+        isPlain = numpy.zeros(len(numbers), dtype = bool)
+
+    # Convert the rest. Numbers too large for 64-bit integers are treated as invalid. (Plain Python
+    # integers are used, as NumPy scalars are much slower.)
+
+    minimumInteger = int(numpy.iinfo(numpy.int64).min)
+    maximumInteger = int(numpy.iinfo(numpy.int64).max)
+
+    for index in numpy.flatnonzero(~isPlain).tolist():
+
+        if not numbers[index]:
+            continue
+
+        number = DeprettifyNumber(numbers[index])
+
+        if minimumInteger <= number <= maximumInteger:
+            results[index] = number
+
+    return results
+
 def FillTemplate(values: Any, template: str) -> str:
 
     ##
@@ -156,13 +373,7 @@ def FillTemplate(values: Any, template: str) -> str:
     #
     ##
 
-    valuesDictionary = vars(values) if not isinstance(values, dict) else values
-    availableValues = [x for x in valuesDictionary if not x.startswith("_")]
-
-    for value in availableValues:
-        template = template.replace(f"@@@{value}@@@", str(valuesDictionary[value]))
-
-    return template
+    return _CompileTemplate(template).Render(values)
 
 def FindFirstMatch(text: str, expression: str) -> Optional[str]:
 
@@ -180,7 +391,7 @@ def FindFirstMatch(text: str, expression: str) -> Optional[str]:
     if (not text) or (not expression):
         return None
 
-    match = re.search(expression, text)
+    match = CompileExpression(expression).search(text)
     if not match:
         return None
 
@@ -212,53 +423,171 @@ def GetDateFromTimestamp(timestamp: str) -> str:
 
     return date.fromtimestamp(timestamp).isoformat()
 
-def GetLevenshteinDistance(firstString: str, secondString: str) -> int:
+def GetDisplayWidth(text: str) -> int:
 
     ##
     #
-    # Calculates the Levenshtein distance between a pair of strings.
+    # Calculates the number of terminal columns taken by a string. Wide (East Asian) characters
+    # take two columns; combining marks, control characters and other invisible characters take
+    # none.
+    #
+    # @param text The string.
+    #
+    # @return The display width of the string.
+    #
+    ##
+
+    if not text:
+        return 0
+
+    elif text.isascii() and text.isprintable():
+        return len(text)
+
+    codes = numpy.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype = "<u4")
+
+    return int(_GetMeasurementUnits(codes, numpy.zeros(1, dtype = numpy.int64), "width").sum())
+
+def GetLevenshteinDistance(
+    firstString: str,
+    secondString: str,
+    maxDistance: Optional[int] = None
+) -> int:
+
+    ##
+    #
+    # Calculates the Levenshtein distance between a pair of strings. Uses the bit-parallel algorithm
+    # by Myers (in Hyyrö's formulation), which needs a single pass over the second string.
     #
     # @param firstString  The first string.
     # @param secondString The second string.
+    # @param maxDistance  The maximum distance of interest. If the strings are further apart than
+    #                     that, the calculation stops early and *maxDistance + 1* is returned.
+    #                     Optional.
     #
     # @return The distance between the two strings.
     #
     ##
 
-    if (not firstString) and (not secondString):
+    firstString = firstString or ""
+    secondString = secondString or ""
+
+    # Check the trivial cases.
+
+    if firstString == secondString:
         return 0
 
-    sizeH = len(firstString) + 1
-    sizeV = len(secondString) + 1
+    if (maxDistance is not None) and (abs(len(firstString) - len(secondString)) > maxDistance):
+        return maxDistance + 1
 
-    matrix = [[0 for i in range(sizeV)] for j in range(sizeH)]
+    # Skip the common prefix and the common suffix; they don't affect the distance.
 
-    for x in range(sizeH):
-        matrix[x][0] = x
-    for y in range(sizeV):
-        matrix[0][y] = y
+    prefixLength = 0
+    shorterLength = min(len(firstString), len(secondString))
 
-    for x in range(1, sizeH):
+    while (
+        (prefixLength < shorterLength) and
+        (firstString[prefixLength] == secondString[prefixLength])
+    ):
+        prefixLength += 1
 
-        for y in range(1, sizeV):
+    suffixLength = 0
+    shorterLength -= prefixLength
 
-            if firstString[x - 1] == secondString[y - 1]:
+    while (
+        (suffixLength < shorterLength) and
+        (firstString[-suffixLength - 1] == secondString[-suffixLength - 1])
+    ):
+        suffixLength += 1
 
-                matrix[x][y] = min(
-                    matrix[x - 1][y    ] + 1,
-                    matrix[x - 1][y - 1]    ,
-                    matrix[x    ][y - 1] + 1
-                )
+    firstString = firstString[prefixLength:len(firstString) - suffixLength]
+    secondString = secondString[prefixLength:len(secondString) - suffixLength]
 
-            else:
+    # Use the shorter string as the pattern, so that the bit vectors stay small.
 
-                matrix[x][y] = min(
-                    matrix[x - 1][y    ] + 1,
-                    matrix[x - 1][y - 1] + 1,
-                    matrix[x    ][y - 1] + 1
-                )
+    if len(firstString) > len(secondString):
+        firstString, secondString = secondString, firstString
+
+    if not firstString:
+        return len(secondString)
+
+    return _GetBitParallelLevenshteinDistance(
+        _GetPatternBitmasks(firstString),
+        len(firstString),
+        secondString,
+        maxDistance
+    )
+
+def GetLevenshteinDistanceMatrix(
+    firstStrings: List[str],
+    secondStrings: List[str],
+    maxDistance: Optional[int] = None,
+    processCount: int = 1
+) -> numpy.ndarray:
+
+    ##
+    #
+    # Calculates the Levenshtein distance between every pair of strings coming from two lists.
+    # Each distinct string is prepared only once, no matter how many pairs it appears in.
+    #
+    # @param firstStrings  The first list of strings (the rows of the matrix).
+    # @param secondStrings The second list of strings (the columns of the matrix).
+    # @param maxDistance   The maximum distance of interest (see *GetLevenshteinDistance*).
+    #                      Optional.
+    # @param processCount  The number of processes the rows are to be distributed between.
+    #
+    # @return A matrix of distances, of shape (len(firstStrings), len(secondStrings)).
+    #
+    ##
+
+    firstStrings = [x or "" for x in firstStrings]
+    secondStrings = [x or "" for x in secondStrings]
+
+    if (not firstStrings) or (not secondStrings):
+        return numpy.zeros((len(firstStrings), len(secondStrings)), dtype = numpy.int32)
+
+    # Find the distinct strings.
 
-    return matrix[sizeH - 1][sizeV - 1]
+    uniqueFirstStrings = list(dict.fromkeys(firstStrings))
+    uniqueSecondStrings = list(dict.fromkeys(secondStrings))
+
+    # Calculate the distances between the distinct strings.
+
+    processCount = max(1, min(processCount, len(uniqueFirstStrings)))
+
+    if 1 == processCount:
+
+        uniqueMatrix = _GetLevenshteinDistanceMatrixRows(
+            uniqueFirstStrings,
+            uniqueSecondStrings,
+            maxDistance
+        )
+
+    else:
+
+        blockSize = -(-len(uniqueFirstStrings) // processCount)
+        blocks = [
+            uniqueFirstStrings[index:index + blockSize]
+            for index in range(0, len(uniqueFirstStrings), blockSize)
+        ]
+
+        with ProcessPoolExecutor(max_workers = processCount) as executor:
+
+            uniqueMatrix = numpy.concatenate(list(executor.map(
+                _GetLevenshteinDistanceMatrixRows,
+                blocks,
+                [uniqueSecondStrings] * len(blocks),
+                [maxDistance] * len(blocks)
+            )))
+
+    # Expand the matrix so that it covers all the input strings.
+
+    firstIndices = {string: index for index, string in enumerate(uniqueFirstStrings)}
+    secondIndices = {string: index for index, string in enumerate(uniqueSecondStrings)}
+
+    rowIndices = numpy.fromiter((firstIndices[x] for x in firstStrings), dtype = numpy.intp)
+    columnIndices = numpy.fromiter((secondIndices[x] for x in secondStrings), dtype = numpy.intp)
+
+    return uniqueMatrix[numpy.ix_(rowIndices, columnIndices)]
 
 def GetLongestLeadingSubstring(strings: List[str]) -> Optional[str]:
 
@@ -272,44 +601,54 @@ def GetLongestLeadingSubstring(strings: List[str]) -> Optional[str]:
     #
     ##
 
-    if not strings:
+    if (not strings) or (not any(strings)):
         return None
 
-    shortestStringLength = 0
-    for string in strings:
-        shortestStringLength = max(shortestStringLength, len(string))
+    return _GetCommonPrefix(strings)
 
-    if not shortestStringLength:
-        return None
+def GetRomanNumeral(number: int) -> Optional[str]:
 
-    longestLeadingSubstring = ""
-    currentCharacter = strings[0][0]
+    ##
+    #
+    # Converts an integer to a Roman numeral.
+    #
+    # @param number The input number (from 1 to *MAXIMUM_ROMAN_NUMERAL*).
+    #
+    # @return The Roman numeral, or **None** (if the number is out of range).
+    #
+    ##
 
-    for characterIndex in range(0, shortestStringLength):
+    numerals = _GetRomanNumeralTables()[0]
 
-        allStringsMatchCharacter = True
+    # Booleans are integers too, but they aren't meant to be numbered.
 
-        for string in strings:
+    if (not isinstance(number, Integral)) or isinstance(number, bool):
+        return None
 
-            if string[characterIndex] != currentCharacter:
-                allStringsMatchCharacter = False
-                break
+    if not (1 <= number <= MAXIMUM_ROMAN_NUMERAL):
+        return None
 
-        if not allStringsMatchCharacter:
-            break
+    return numerals[number]
 
-        longestLeadingSubstring += currentCharacter
+def GetRomanNumerals(numbers: Iterable[int]) -> List[Optional[str]]:
 
-        if characterIndex != shortestStringLength - 2:
-            currentCharacter = strings[0][characterIndex + 1]
+    ##
+    #
+    # Converts multiple integers to Roman numerals (see *GetRomanNumeral*).
+    #
+    # @param numbers The input numbers.
+    #
+    # @return A list of Roman numerals (or **None**s).
+    #
+    ##
 
-    return longestLeadingSubstring
+    return [GetRomanNumeral(number) for number in numbers]
 
 def IsRomanNumeral(text: str) -> bool:
 
     ##
     #
-    # Checks if given string is a Roman numeral.
+    # Checks if given string is a (valid) Roman numeral.
     #
     # @param text The input string.
     #
@@ -317,10 +656,7 @@ def IsRomanNumeral(text: str) -> bool:
     #
     ##
 
-    if (not text) or any(x not in VALID_ROMAN_NUMERAL_CHARACTERS for x in text.strip()):
-        return False
-
-    return True
+    return ParseRomanNumeral(text) is not None
 
 def IsStringEmpty(text: str) -> bool:
 
@@ -340,6 +676,40 @@ def IsStringEmpty(text: str) -> bool:
 
     return False
 
+def ParseRomanNumeral(text: str) -> Optional[int]:
+
+    ##
+    #
+    # Converts a Roman numeral to an integer. Only valid, uppercase numerals are accepted (so "IX"
+    # is converted, but "VIIII", "IIX" or "ix" are not).
+    #
+    # @param text The input string.
+    #
+    # @return The value of the numeral, or **None**.
+    #
+    ##
+
+    if not text:
+        return None
+
+    return _GetRomanNumeralTables()[1].get(text.strip())
+
+def ParseRomanNumerals(texts: Iterable[str]) -> List[Optional[int]]:
+
+    ##
+    #
+    # Converts multiple Roman numerals to integers (see *ParseRomanNumeral*).
+    #
+    # @param texts The input strings.
+    #
+    # @return A list of integers (or **None**s).
+    #
+    ##
+
+    values = _GetRomanNumeralTables()[1]
+
+    return [values.get(text.strip()) if text else None for text in texts]
+
 def PrettifyDate(
     date: str,
     inputFormat: str = "%Y-%m-%d",
@@ -358,13 +728,7 @@ def PrettifyDate(
     #
     ##
 
-    if "?" == date:
-        return date
-
-    return format_date(
-        datetime.strptime(date, inputFormat),
-        locale = locale
-    )
+    return _GetDateFormatter(inputFormat, locale).Format(date)
 
 def PrettifyNumber(
     number: int,
@@ -384,13 +748,7 @@ def PrettifyNumber(
     #
     ##
 
-    if (0 == number) and isZeroSpecial:
-        return "?"
-
-    return format_decimal(
-        number,
-        locale = locale
-    )
+    return _GetNumberFormatter(locale, isZeroSpecial).Format(number)
 
 def PrettifyTitle(title: str, removeContext: bool) -> str:
 
@@ -405,58 +763,22 @@ def PrettifyTitle(title: str, removeContext: bool) -> str:
     #
     ##
 
-    if not title:
-        return title
-
-    if removeContext:
-
-        POSSIBLE_PREFIXES = [
-            "Chapter \d+",
-            "Ch\. \d+",
-            "Update \d+",
-            "Part \d+",
-        ]
-
-        POSSIBLE_POSTFIXES = [
-            "Finale",
-            "Final Part",
-            "Final Update",
-            "Final",
-            "Chapter \d+",
-            "Ch\. \d+",
-            "Update \d+",
-            "Part \d+",
-        ]
-
-        POSSIBLE_PREFIXES_JOINED = "|".join(POSSIBLE_PREFIXES)
-        POSSIBLE_POSTFIXES_JOINED = "|".join(POSSIBLE_POSTFIXES)
-
-        title = re.sub(
-            f"^\[?\(?({POSSIBLE_PREFIXES_JOINED}|\d+)\)?\]?\s*:?-?\.?",
-            "",
-            title,
-            flags = re.IGNORECASE | re.MULTILINE
-        )
-
-        title = re.sub(
-            f"\(?\[?({POSSIBLE_POSTFIXES_JOINED})\)?\]?$",
-            "",
-            title,
-            flags = re.IGNORECASE | re.MULTILINE
-        )
-
-    title = re.sub("(\\s)\\?", "?", title)
-    title = re.sub("(\\s)\\!", "!", title)
+    return _GetDefaultTitleNormalizer().Normalize(title, removeContext)
 
-    title = titlecase(title)
-    title = title.strip()
+def PrettifyTitles(titles: Iterable[str], removeContext: bool) -> List[str]:
 
-    if IsStringEmpty(title):
-        title = ""
-    else:
-        title = title[0].upper() + title[1:]
+    ##
+    #
+    # Returns prettified titles (see *PrettifyTitle*).
+    #
+    # @param titles        The input titles.
+    # @param removeContext Should we remove the context? (Like "Chapter 3: ".)
+    #
+    # @return Prettified input titles.
+    #
+    ##
 
-    return title
+    return _GetDefaultTitleNormalizer().NormalizeMany(titles, removeContext)
 
 def SeparateSubtitle(title: str) -> Optional[str]:
 
@@ -470,25 +792,15 @@ def SeparateSubtitle(title: str) -> Optional[str]:
     #
     ##
 
-    if not title:
-        return None
-
-    subtitle = re.sub("\d+\.+:*", ":", title)
-    subtitle = re.sub("\s+-\s+", " : ", subtitle)
-
-    semicolonPosition = subtitle.find(":")
-    if -1 != semicolonPosition:
-        subtitle = subtitle[semicolonPosition + 1:]
-
-    subtitle = subtitle.strip()
-
-    return subtitle
+    return _GetDefaultSubtitleSeparator().SeparateSubtitle(title)
 
 def Stringify(value: Any, encoding = "utf-8") -> str:
 
     ##
     #
-    # Converts any value to a string.
+    # Converts any value to a string. Buffers (*bytearray*, *memoryview* and *mmap* objects) are
+    # decoded without being copied first. Pure ASCII input in a legacy ASCII-compatible encoding
+    # (e.g. "cp1252") is decoded using the (faster) ASCII codec.
     #
     # @param value    The input value.
     # @param encoding The expected text encoding.
@@ -503,12 +815,86 @@ def Stringify(value: Any, encoding = "utf-8") -> str:
     elif isinstance(value, str):
         return value
 
-    elif isinstance(value, bytes):
+    elif isinstance(value, (bytes, bytearray)):
+        if _IsLegacyASCIICompatibleEncoding(encoding) and value.isascii():
+            return value.decode("ascii")
+
         return value.decode(encoding, errors = "ignore")
 
+    elif _IsBuffer(value):
+        return str(value, encoding, "ignore")
+
     else:
         return str(value)
 
+def StringifyChunks(
+    source: Any,
+    encoding: str = "utf-8",
+    chunkSize: int = STRINGIFY_CHUNK_SIZE
+) -> Iterator[str]:
+
+    ##
+    #
+    # Decodes a stream of bytes incrementally (see *Stringify*), without materializing the whole
+    # text. Multi-byte characters split between chunks are handled correctly.
+    #
+    # @param source    The input: a buffer (*bytes*, *bytearray*, *memoryview* or *mmap*), a binary
+    #                  file-like object, or an iterable of byte chunks (e.g.
+    #                  *Response.iter_content()*).
+    #                  String chunks are passed through unchanged.
+    # @param encoding  The expected text encoding.
+    # @param chunkSize The size of the chunks read from buffers and files.
+    #
+    # @return An iterator over non-empty pieces of text.
+    #
+    ##
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors = "ignore")
+    isASCIICompatible = _IsLegacyASCIICompatibleEncoding(encoding)
+
+    for chunk in _IterateByteChunks(source, chunkSize):
+        if isinstance(chunk, str):
+            text = chunk
+
+        elif (
+            isASCIICompatible and
+            isinstance(chunk, bytes) and
+            chunk.isascii() and
+            not decoder.getstate()[0]
+        ):
+            text = chunk.decode("ascii")
+
+        else:
+            text = decoder.decode(chunk)
+
+        if text:
+            yield text
+
+    text = decoder.decode(b"", final = True)
+    if text:
+        yield text
+
+def Titlecase(text: str) -> str:
+
+    ##
+    #
+    # Converts text to title case. Gives the same results as the *titlecase* package, but handles
+    # common (ASCII) titles on its own, which is several times faster. Anything more unusual is
+    # passed to the *titlecase* package.
+    #
+    # @param text The input text.
+    #
+    # @return The input text, in title case.
+    #
+    ##
+
+    if not text:
+        return text
+
+    titlecasedText = _GetFastTitlecase(text)
+
+    return titlecasedText if (titlecasedText is not None) else titlecase(text)
+
 def Truncate(string: str, length: int, suffix: str = "…") -> str:
 
     ##
@@ -545,4 +931,2144 @@ def TruncateByWords(string: str, length: int, suffix: str = "…") -> str:
     if len(string) <= length:
         return string
 
-    return string[:length - len(suffix)].rsplit(" ", 1)[0] + suffix
\ No newline at end of file
+    spacePosition = string.rfind(" ", 0, length - len(suffix))
+
+    return string[:spacePosition if (-1 != spacePosition) else (length - len(suffix))] + suffix
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Represents a template (see *FillTemplate*) parsed once, and ready to be filled in any number of
+# times.
+#
+##
+
+class CompiledTemplate:
+
+    def __init__(self, template: str) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param template Template code.
+        #
+        ##
+
+        # Splitting by the variable expression yields literal text at even indices and variable
+        # names at odd ones. The names are replaced with their literal form, so that unknown
+        # variables are left untouched; the substitutable ones are remembered separately.
+
+        self._segments = TEMPLATE_VARIABLE_EXPRESSION.split(template or "")
+        self._variables = {}
+
+        for index in range(1, len(self._segments), 2):
+
+            name = self._segments[index]
+
+            if not name.startswith("_"):
+                self._variables[index] = name
+
+            self._segments[index] = f"@@@{name}@@@"
+
+    def Iterate(self, values: Any) -> Iterator[str]:
+
+        ##
+        #
+        # Fills in the template, yielding it piece by piece instead of building the whole string.
+        # Values are yielded as they are, without being copied; a value being an iterator (e.g. a
+        # generator) is treated as a sequence of chunks and yielded one chunk at a time.
+        #
+        # @param values Iterable values (see *FillTemplate*).
+        #
+        # @return An iterator over the pieces of the filled template.
+        #
+        ##
+
+        valuesDictionary = vars(values) if not isinstance(values, dict) else values
+
+        for index, segment in enumerate(self._segments):
+
+            name = self._variables.get(index)
+
+            if (name is None) or (name not in valuesDictionary):
+
+                if segment:
+                    yield segment
+
+                continue
+
+            value = valuesDictionary[name]
+
+            if isinstance(value, Iterator):
+                for chunk in value:
+                    yield Stringify(chunk)
+            else:
+                yield str(value)
+
+    def Render(self, values: Any) -> str:
+
+        ##
+        #
+        # Fills in the template.
+        #
+        # @param values Iterable values (see *FillTemplate*).
+        #
+        # @return Template code with variables filled in.
+        #
+        ##
+
+        valuesDictionary = vars(values) if not isinstance(values, dict) else values
+
+        segments = self._segments.copy()
+
+        for index, name in self._variables.items():
+            if name in valuesDictionary:
+                segments[index] = str(valuesDictionary[name])
+
+        return "".join(segments)
+
+    def RenderMany(self, valuesList: Iterable[Any]) -> List[str]:
+
+        ##
+        #
+        # Fills in the template multiple times.
+        #
+        # @param valuesList A list of iterable values (see *FillTemplate*).
+        #
+        # @return A list of template codes with variables filled in.
+        #
+        ##
+
+        return [self.Render(values) for values in valuesList]
+
+    def Write(self, values: Any, file: IO[str]) -> None:
+
+        ##
+        #
+        # Fills in the template, writing it piece by piece to a file (or any other object with the
+        # *write* method). See *Iterate*.
+        #
+        # @param values Iterable values (see *FillTemplate*).
+        # @param file   The output file.
+        #
+        ##
+
+        for piece in self.Iterate(values):
+            file.write(piece)
+
+##
+#
+# Formats dates (see *PrettifyDate*). The locale and the date pattern are resolved only once, and
+# the results are cached.
+#
+##
+
+class DateFormatter:
+
+    def __init__(
+        self,
+        inputFormat: str = "%Y-%m-%d",
+        locale: str = "en",
+        cacheSize: int = FORMATTER_CACHE_SIZE
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param inputFormat The format of the input dates.
+        # @param locale      The locale to be used for formatting.
+        # @param cacheSize   The maximum number of cached dates.
+        #
+        ##
+
+        self._inputFormat = inputFormat
+        self._locale = Locale.parse(locale)
+        self._pattern = parse_date_pattern(get_date_format("medium", locale = self._locale))
+
+        self._cachedFormat = lru_cache(maxsize = cacheSize)(self._Format)
+
+    def Format(self, date: str) -> str:
+
+        ##
+        #
+        # Returns a nicely formatted date.
+        #
+        # @param date The input date.
+        #
+        # @return Prettified input date.
+        #
+        ##
+
+        if "?" == date:
+            return date
+
+        return self._cachedFormat(date)
+
+    def FormatMany(self, dates: Iterable[str]) -> List[str]:
+
+        ##
+        #
+        # Returns nicely formatted dates.
+        #
+        # @param dates The input dates.
+        #
+        # @return Prettified input dates.
+        #
+        ##
+
+        return [self.Format(date) for date in dates]
+
+    def _Format(self, date: str) -> str:
+
+        ##
+        #
+        # Returns a nicely formatted date, without using the cache.
+        #
+        # @param date The input date.
+        #
+        # @return Prettified input date.
+        #
+        ##
+
+        parsedDate = None
+
+        # ISO 8601 dates are parsed without strptime, which is much slower. Only the "YYYY-MM-DD"
+        # form is, though: *fromisoformat* accepts other ones (e.g. week dates) as well.
+
+        if (
+            ("%Y-%m-%d" == self._inputFormat) and
+            (10 == len(date)) and
+            (date[4] == "-" == date[7]) and
+            (date[:4] + date[5:7] + date[8:]).isdigit()
+        ):
+
+            try:
+                parsedDate = datetime.fromisoformat(date)
+            except ValueError:
+                pass
+
+        if parsedDate is None:
+            parsedDate = datetime.strptime(date, self._inputFormat)
+
+        return self._pattern.apply(parsedDate.date(), self._locale)
+
+##
+#
+# An index of strings, allowing for quick lookup of the strings similar to a given one (in terms of
+# the Levenshtein distance). Implemented as a BK-tree.
+#
+##
+
+class FuzzyStringIndex:
+
+    def __init__(self, strings: Optional[Iterable[str]] = None) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param strings The initial contents of the index. Optional.
+        #
+        ##
+
+        # The nodes of the tree are stored in two parallel lists: the strings, and the mappings
+        # from distances to child node indices. Node 0 is the root.
+
+        self._strings = []
+        self._children = []
+        self._knownStrings = set()
+
+        if strings:
+            self.AddMany(strings)
+
+    def __contains__(self, string: str) -> bool:
+
+        ##
+        #
+        # Checks whether given string is stored in the index.
+        #
+        # @param string The string.
+        #
+        # @return **True** if the string is stored in the index, **False** otherwise.
+        #
+        ##
+
+        return string in self._knownStrings
+
+    def __len__(self) -> int:
+
+        ##
+        #
+        # Returns the number of strings stored in the index.
+        #
+        # @return The number of strings.
+        #
+        ##
+
+        return len(self._strings)
+
+    def __getstate__(self) -> Dict[str, Any]:
+
+        ##
+        #
+        # Returns the state of the object to be pickled. The set of known strings is not stored,
+        # since it can be recreated from the list of strings.
+        #
+        # @return The state of the object.
+        #
+        ##
+
+        return {
+            "Strings": self._strings,
+            "Children": self._children,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+
+        ##
+        #
+        # Restores the state of an unpickled object.
+        #
+        # @param state The state of the object.
+        #
+        ##
+
+        self._strings = state["Strings"]
+        self._children = state["Children"]
+        self._knownStrings = set(self._strings)
+
+    def Add(self, string: str) -> bool:
+
+        ##
+        #
+        # Adds a string to the index.
+        #
+        # @param string The string.
+        #
+        # @return **True** if the string has been added, **False** if it was already stored.
+        #
+        ##
+
+        string = string or ""
+
+        if string in self._knownStrings:
+            return False
+
+        self._knownStrings.add(string)
+        self._strings.append(string)
+        self._children.append({})
+
+        newNodeIndex = len(self._strings) - 1
+        if not newNodeIndex:
+            return True
+
+        nodeIndex = 0
+
+        while True:
+
+            distance = GetLevenshteinDistance(string, self._strings[nodeIndex])
+            children = self._children[nodeIndex]
+
+            if distance not in children:
+                children[distance] = newNodeIndex
+                return True
+
+            nodeIndex = children[distance]
+
+    def AddMany(self, strings: Iterable[str]) -> None:
+
+        ##
+        #
+        # Adds multiple strings to the index.
+        #
+        # @param strings The strings.
+        #
+        ##
+
+        for string in strings:
+            self.Add(string)
+
+    def Find(self, string: str, maxDistance: int) -> List[Tuple[str, int]]:
+
+        ##
+        #
+        # Finds all the stored strings within given distance from a string.
+        #
+        # @param string      The string.
+        # @param maxDistance The maximum distance.
+        #
+        # @return A list of pairs (string, distance), sorted by the distance.
+        #
+        ##
+
+        string = string or ""
+
+        if not self._strings:
+            return []
+
+        results = []
+        nodeIndices = [0]
+
+        while nodeIndices:
+
+            nodeIndex = nodeIndices.pop()
+            children = self._children[nodeIndex]
+
+            # Children are only reachable if the distance doesn't exceed the largest child key by
+            # more than maxDistance; any further, the exact distance doesn't matter.
+
+            distance = GetLevenshteinDistance(
+                string,
+                self._strings[nodeIndex],
+                maxDistance = maxDistance + (max(children) if children else 0)
+            )
+
+            if distance <= maxDistance:
+                results.append((self._strings[nodeIndex], distance))
+
+            for childDistance, childIndex in children.items():
+                if abs(childDistance - distance) <= maxDistance:
+                    nodeIndices.append(childIndex)
+
+        results.sort(key = lambda x: (x[1], x[0]))
+
+        return results
+
+    def FindNearest(
+        self,
+        string: str,
+        count: int = 1,
+        maxDistance: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+
+        ##
+        #
+        # Finds the stored strings nearest to a string.
+        #
+        # @param string      The string.
+        # @param count       The maximum number of strings to be found.
+        # @param maxDistance The maximum distance. Optional.
+        #
+        # @return A list of pairs (string, distance), sorted by the distance.
+        #
+        ##
+
+        string = string or ""
+
+        if (not self._strings) or (count < 1):
+            return []
+
+        # The results are kept sorted, the worst one last; the search radius shrinks as better
+        # candidates are found.
+
+        results = []
+        radius = maxDistance
+        nodeIndices = [0]
+
+        while nodeIndices:
+
+            nodeIndex = nodeIndices.pop()
+            children = self._children[nodeIndex]
+
+            distanceLimit = None
+            if radius is not None:
+                distanceLimit = radius + (max(children) if children else 0)
+
+            distance = GetLevenshteinDistance(
+                string,
+                self._strings[nodeIndex],
+                maxDistance = distanceLimit
+            )
+
+            if (radius is None) or (distance <= radius):
+
+                result = (distance, self._strings[nodeIndex])
+
+                if (len(results) < count) or (result < results[-1]):
+                    bisect.insort(results, result)
+                    del results[count:]
+
+                if len(results) == count:
+                    worstDistance = results[-1][0]
+                    radius = worstDistance if (radius is None) else min(radius, worstDistance)
+
+            # Visit the most promising children first.
+
+            childIndices = [
+                (abs(childDistance - distance), childIndex)
+                for childDistance, childIndex in children.items()
+                if (radius is None) or (abs(childDistance - distance) <= radius)
+            ]
+
+            childIndices.sort(reverse = True)
+            nodeIndices.extend(x[1] for x in childIndices)
+
+        return [(x[1], x[0]) for x in results]
+
+    def Save(self, filePath: Union[str, Path]) -> bool:
+
+        ##
+        #
+        # Saves the index to a file.
+        #
+        # @param filePath The file path.
+        #
+        # @return **True** if the index has been saved successfully, **False** otherwise.
+        #
+        ##
+
+        try:
+
+            with open(filePath, "wb") as file:
+                pickle.dump(self, file, protocol = pickle.HIGHEST_PROTOCOL)
+
+            return True
+
+        except OSError:
+
+            return False
+
+    @staticmethod
+    def Load(filePath: Union[str, Path]) -> Optional["FuzzyStringIndex"]:
+
+        ##
+        #
+        # Loads an index from a file.
+        #
+        # @param filePath The file path.
+        #
+        # @return The loaded index, or **None**.
+        #
+        ##
+
+        try:
+
+            with open(filePath, "rb") as file:
+                index = pickle.load(file)
+
+            return index if isinstance(index, FuzzyStringIndex) else None
+
+        except (OSError, pickle.UnpicklingError, EOFError):
+
+            return None
+
+##
+#
+# Finds the first matches of multiple regular expressions (see *FindFirstMatch*) in a single pass
+# over the text.
+#
+##
+
+class MultiMatcher:
+
+    def __init__(self, expressions: Dict[str, str]) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param expressions A dictionary mapping names to regular expressions.
+        #
+        ##
+
+        self._expressions = {name: CompileExpression(x) for name, x in expressions.items() if x}
+
+        # Expressions using backreferences or named groups can't be combined with others; they are
+        # searched for separately.
+
+        self._combinableNames = [
+            name for name, expression in self._expressions.items()
+            if not MULTIMATCHER_EXCLUDED_EXPRESSION.search(expression.pattern)
+        ]
+
+        # Combine the remaining ones into a single alternation. Every alternative ends with an empty
+        # named group, identifying it (a capturing group at the start would prevent the regular
+        # expression engine from skipping ahead to the possible first characters). The combined
+        # expression is compiled only once, and isn't shared through *CompileExpression*.
+
+        try:
+            self._combinedExpression = re.compile("|".join(
+                f"(?:{self._expressions[name].pattern})(?P<_{index}>)"
+                for index, name in enumerate(self._combinableNames)
+            ))
+
+        except re.error:
+            self._combinableNames = []
+            self._combinedExpression = None
+
+        # The number of the first group of every combined expression, within the combined one.
+
+        self._firstGroups = []
+        groupCount = 0
+
+        for name in self._combinableNames:
+            self._firstGroups.append(groupCount + 1)
+            groupCount += self._expressions[name].groups + 1
+
+        self._separateNames = [x for x in self._expressions if x not in self._combinableNames]
+        self._names = list(expressions)
+
+    def Find(self, text: str) -> Dict[str, Optional[str]]:
+
+        ##
+        #
+        # Finds the first matches of the expressions.
+        #
+        # @param text The text.
+        #
+        # @return A dictionary mapping names to the first matching groups (or **None**s).
+        #
+        ##
+
+        results = dict.fromkeys(self._names)
+
+        if not text:
+            return results
+
+        # Search for all the combinable expressions at once. The combined expression matches at the
+        # leftmost position where any of the expressions matches, and reports the first matching
+        # alternative; the preceding ones don't match at that position, the following ones are
+        # checked separately.
+
+        isFound = [False] * len(self._combinableNames)
+        remainingCount = len(self._combinableNames)
+        position = 0
+
+        while remainingCount:
+
+            match = self._combinedExpression.search(text, position)
+            if not match:
+                return self._FindSeparately(text, results)
+
+            position = match.start()
+            matchedIndex = int(match.lastgroup[1:])
+            isRepeated = isFound[matchedIndex]
+
+            if not isRepeated:
+                results[self._combinableNames[matchedIndex]] = match.group(
+                    self._firstGroups[matchedIndex]
+                )
+
+                isFound[matchedIndex] = True
+                remainingCount -= 1
+
+            for index in range(matchedIndex + 1, len(self._combinableNames)):
+
+                if isFound[index]:
+                    continue
+
+                name = self._combinableNames[index]
+
+                match = self._expressions[name].match(text, position)
+                if match:
+                    results[name] = match.group(1)
+
+                    isFound[index] = True
+                    remainingCount -= 1
+
+            position += 1
+
+            # An expression which has already been found matched again; the combined expression
+            # would keep stopping at its matches, so search for the remaining expressions
+            # separately (none of them matches before the current position).
+
+            if isRepeated:
+                remainingNames = [x for x, y in zip(self._combinableNames, isFound) if not y]
+                return self._FindSeparately(text, results, remainingNames, position)
+
+        return self._FindSeparately(text, results)
+
+    def _FindSeparately(
+        self,
+        text: str,
+        results: Dict[str, Optional[str]],
+        names: Iterable[str] = (),
+        position: int = 0
+    ) -> Dict[str, Optional[str]]:
+
+        ##
+        #
+        # Searches for the expressions which can't be combined (and, optionally, for some others),
+        # one by one.
+        #
+        # @param text     The text.
+        # @param results  The dictionary of results, updated in place.
+        # @param names    The names of additional expressions, searched for from given position.
+        # @param position The position.
+        #
+        # @return The results.
+        #
+        ##
+
+        for name in names:
+
+            match = self._expressions[name].search(text, position)
+            if match:
+                results[name] = match.group(1)
+
+        for name in self._separateNames:
+
+            match = self._expressions[name].search(text)
+            if match:
+                results[name] = match.group(1)
+
+        return results
+
+##
+#
+# Formats numbers (see *PrettifyNumber*). The locale and the number pattern are resolved only once,
+# and the results are cached.
+#
+##
+
+class NumberFormatter:
+
+    def __init__(
+        self,
+        locale: str = "en",
+        isZeroSpecial: bool = False,
+        cacheSize: int = FORMATTER_CACHE_SIZE
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param locale        The locale to be used for formatting.
+        # @param isZeroSpecial Should we replace zero with a question mark (0 -> "?")?
+        # @param cacheSize     The maximum number of cached numbers.
+        #
+        ##
+
+        self._locale = Locale.parse(locale)
+        self._pattern = parse_number_pattern(self._locale.decimal_formats[None])
+        self._isZeroSpecial = isZeroSpecial
+
+        self._cachedFormat = lru_cache(maxsize = cacheSize, typed = True)(self._Format)
+
+    def Format(self, number: int) -> str:
+
+        ##
+        #
+        # Returns a nicely formatted number.
+        #
+        # @param number The input number.
+        #
+        # @return Prettified input number.
+        #
+        ##
+
+        if (0 == number) and self._isZeroSpecial:
+            return "?"
+
+        return self._cachedFormat(number)
+
+    def FormatMany(self, numbers: Iterable[int]) -> List[str]:
+
+        ##
+        #
+        # Returns nicely formatted numbers.
+        #
+        # @param numbers The input numbers.
+        #
+        # @return Prettified input numbers.
+        #
+        ##
+
+        return [self.Format(number) for number in numbers]
+
+    def _Format(self, number: int) -> str:
+
+        ##
+        #
+        # Returns a nicely formatted number, without using the cache.
+        #
+        # @param number The input number.
+        #
+        # @return Prettified input number.
+        #
+        ##
+
+        return self._pattern.apply(number, self._locale)
+
+##
+#
+# A prefix tree of strings. Allows for quick retrieval of the longest leading substring (see
+# *GetLongestLeadingSubstring*) of any group of stored strings sharing a prefix.
+#
+##
+
+class PrefixTrie:
+
+    def __init__(self, strings: Optional[Iterable[str]] = None) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param strings The initial contents of the trie. Optional.
+        #
+        ##
+
+        # Every node is a dictionary mapping characters to child nodes. The empty string is used
+        # as a key marking the nodes at which stored strings end.
+
+        self._root = {}
+        self._stringCount = 0
+
+        if strings:
+            self.AddMany(strings)
+
+    def __contains__(self, string: str) -> bool:
+
+        ##
+        #
+        # Checks whether given string is stored in the trie.
+        #
+        # @param string The string.
+        #
+        # @return **True** if the string is stored in the trie, **False** otherwise.
+        #
+        ##
+
+        node = self._FindNode(string)
+
+        return (node is not None) and ("" in node)
+
+    def __len__(self) -> int:
+
+        ##
+        #
+        # Returns the number of strings stored in the trie.
+        #
+        # @return The number of strings.
+        #
+        ##
+
+        return self._stringCount
+
+    def Add(self, string: str) -> bool:
+
+        ##
+        #
+        # Adds a string to the trie.
+        #
+        # @param string The string.
+        #
+        # @return **True** if the string has been added, **False** if it was already stored.
+        #
+        ##
+
+        node = self._root
+
+        for character in string:
+            node = node.setdefault(character, {})
+
+        if "" in node:
+            return False
+
+        node[""] = {}
+        self._stringCount += 1
+
+        return True
+
+    def AddMany(self, strings: Iterable[str]) -> None:
+
+        ##
+        #
+        # Adds multiple strings to the trie.
+        #
+        # @param strings The strings.
+        #
+        ##
+
+        for string in strings:
+            self.Add(string)
+
+    def GetLongestLeadingSubstring(self, prefix: str = "") -> Optional[str]:
+
+        ##
+        #
+        # Retrieves the longest leading substring of the stored strings starting with given prefix.
+        #
+        # @param prefix The prefix selecting the group of strings. Optional; by default, all the
+        #               stored strings are taken into account.
+        #
+        # @return The longest leading substring, or **None** (if no stored string starts with the
+        #         prefix).
+        #
+        ##
+
+        node = self._FindNode(prefix)
+        if not node:
+            return None
+
+        characters = [prefix]
+
+        while (1 == len(node)) and ("" not in node):
+
+            character, node = next(iter(node.items()))
+            characters.append(character)
+
+        return "".join(characters)
+
+    def GetCommonPrefix(self, strings: Iterable[str]) -> Optional[str]:
+
+        ##
+        #
+        # Retrieves the common prefix of an arbitrary group of the stored strings, i.e. the prefix
+        # corresponding to their deepest shared node.
+        #
+        # @param strings The group of strings.
+        #
+        # @return The common prefix, or **None** (if the group is empty, or some of the strings
+        #         aren't stored in the trie).
+        #
+        ##
+
+        strings = list(strings)
+
+        if (not strings) or any((x not in self) for x in strings):
+            return None
+
+        return _GetCommonPrefix(strings)
+
+    def _FindNode(self, string: str) -> Optional[Dict[str, Any]]:
+
+        ##
+        #
+        # Finds the node corresponding to given string.
+        #
+        # @param string The string.
+        #
+        # @return The node, or **None**.
+        #
+        ##
+
+        node = self._root
+
+        for character in string:
+
+            node = node.get(character)
+            if node is None:
+                return None
+
+        return node
+
+##
+#
+# Separates titles from subtitles (see *SeparateSubtitle*). Every title is scanned only once, and
+# the results are cached.
+#
+##
+
+class SubtitleSeparator:
+
+    def __init__(self, cacheSize: int = TITLE_CACHE_SIZE) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param cacheSize The maximum number of cached titles. Zero disables the cache.
+        #
+        ##
+
+        self._cachedSeparate = (
+            lru_cache(maxsize = cacheSize)(self._Separate) if cacheSize else self._Separate
+        )
+
+    def Separate(self, title: str) -> Optional[Tuple[str, str]]:
+
+        ##
+        #
+        # Splits a title into its prefix and its subtitle ("aaa: bbbbb" will return ("aaa",
+        # "bbbbb")).
+        #
+        # @param title The title as it was retrieved.
+        #
+        # @return A tuple (prefix, subtitle); or **None**, if the title is empty. The prefix is
+        #         empty if the title has no separator.
+        #
+        ##
+
+        if not title:
+            return None
+
+        return self._cachedSeparate(title)
+
+    def SeparateMany(self, titles: Iterable[str]) -> List[Optional[Tuple[str, str]]]:
+
+        ##
+        #
+        # Splits titles into their prefixes and their subtitles (see *Separate*).
+        #
+        # @param titles The titles as they were retrieved.
+        #
+        # @return The prefixes and the subtitles.
+        #
+        ##
+
+        return [self.Separate(title) for title in titles]
+
+    def SeparateSubtitle(self, title: str) -> Optional[str]:
+
+        ##
+        #
+        # Retrieves the proper subtitle of the story ("aaa: bbbbb" will return "bbbbb").
+        #
+        # @param title The title as it was retrieved.
+        #
+        # @return The subtitle.
+        #
+        ##
+
+        if not title:
+            return None
+
+        return self._cachedSeparate(title)[1]
+
+    def SeparateSubtitles(self, titles: Iterable[str]) -> List[Optional[str]]:
+
+        ##
+        #
+        # Retrieves the proper subtitles of stories (see *SeparateSubtitle*).
+        #
+        # @param titles The titles as they were retrieved.
+        #
+        # @return The subtitles.
+        #
+        ##
+
+        return [self.SeparateSubtitle(title) for title in titles]
+
+    def _Separate(self, title: str) -> Tuple[str, str]:
+
+        ##
+        #
+        # Splits a title into its prefix and its subtitle, without using the cache.
+        #
+        # @param title The title.
+        #
+        # @return A tuple (prefix, subtitle).
+        #
+        ##
+
+        match = SUBTITLE_SEPARATOR_EXPRESSION.search(title)
+        if not match:
+            return "", title.strip()
+
+        # Separators found in the subtitle are normalized, just like the first one.
+
+        subtitle = SUBTITLE_NUMBER_EXPRESSION.sub(":", title[match.end():])
+        subtitle = SUBTITLE_DASH_EXPRESSION.sub(" : ", subtitle)
+
+        return title[:match.start()].strip(), subtitle.strip()
+
+##
+#
+# Prettifies titles (see *PrettifyTitle*). The regular expressions are compiled only once, and the
+# results are cached, so that repeated titles are processed only once.
+#
+##
+
+class TitleNormalizer:
+
+    def __init__(
+        self,
+        prefixes: Optional[List[str]] = None,
+        postfixes: Optional[List[str]] = None,
+        cacheSize: int = TITLE_CACHE_SIZE,
+        exactTitlecase: bool = False
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param prefixes       Regular expressions matching the context preceding the title (like
+        #                       "Chapter 3"). Optional; *TITLE_PREFIXES* are used by default.
+        # @param postfixes      Regular expressions matching the context following the title (like
+        #                       "Final Part"). Optional; *TITLE_POSTFIXES* are used by default.
+        # @param cacheSize      The maximum number of cached titles.
+        # @param exactTitlecase Should the *titlecase* package always be used (instead of the
+        #                       faster *Titlecase* function)?
+        #
+        ##
+
+        prefixesJoined = "|".join(prefixes if (prefixes is not None) else TITLE_PREFIXES)
+        postfixesJoined = "|".join(postfixes if (postfixes is not None) else TITLE_POSTFIXES)
+
+        self._prefixExpression = re.compile(
+            f"^\\[?\\(?({prefixesJoined}|\\d+)\\)?\\]?\\s*:?-?\\.?",
+            flags = re.IGNORECASE | re.MULTILINE
+        )
+
+        self._postfixExpression = re.compile(
+            f"\\(?\\[?({postfixesJoined})\\)?\\]?$",
+            flags = re.IGNORECASE | re.MULTILINE
+        )
+
+        self._punctuationExpression = re.compile("\\s([?!])")
+
+        self._titlecase = titlecase if exactTitlecase else Titlecase
+
+        self._cachedNormalize = lru_cache(maxsize = cacheSize)(self._Normalize)
+
+    def Normalize(self, title: str, removeContext: bool) -> str:
+
+        ##
+        #
+        # Returns a prettified title.
+        #
+        # @param title         The input title.
+        # @param removeContext Should we remove the context? (Like "Chapter 3: ".)
+        #
+        # @return Prettified input title.
+        #
+        ##
+
+        if not title:
+            return title
+
+        return self._cachedNormalize(title, removeContext)
+
+    def NormalizeMany(self, titles: Iterable[str], removeContext: bool) -> List[str]:
+
+        ##
+        #
+        # Returns prettified titles.
+        #
+        # @param titles        The input titles.
+        # @param removeContext Should we remove the context? (Like "Chapter 3: ".)
+        #
+        # @return Prettified input titles.
+        #
+        ##
+
+        return [self.Normalize(title, removeContext) for title in titles]
+
+    def _Normalize(self, title: str, removeContext: bool) -> str:
+
+        ##
+        #
+        # Returns a prettified title, without using the cache.
+        #
+        # @param title         The input title.
+        # @param removeContext Should we remove the context? (Like "Chapter 3: ".)
+        #
+        # @return Prettified input title.
+        #
+        ##
+
+        if removeContext:
+            title = self._prefixExpression.sub("", title)
+            title = self._postfixExpression.sub("", title)
+
+        title = self._punctuationExpression.sub("\\1", title)
+
+        title = self._titlecase(title)
+        title = title.strip()
+
+        if IsStringEmpty(title):
+            title = ""
+        else:
+            title = title[0].upper() + title[1:]
+
+        return title
+
+##
+#
+# Truncates strings (see *Truncate* and *TruncateByWords*), measuring them in code points, grapheme
+# clusters or terminal columns (see *GetDisplayWidth*). Whole columns of strings can be truncated at
+# once.
+#
+##
+
+class Truncator:
+
+    def __init__(self, measure: str = "characters", suffix: str = "…") -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param measure The unit of length: "characters" (code points), "graphemes" (grapheme
+        #                clusters) or "width" (terminal columns).
+        # @param suffix  The suffix of the truncated strings.
+        #
+        ##
+
+        if measure not in TRUNCATION_MEASURES:
+            raise ValueError(f"Unknown measure: \"{measure}\".")
+
+        self._measure = measure
+        self._suffix = suffix
+        self._suffixLength = self.Measure(suffix)
+
+    def Measure(self, string: str) -> int:
+
+        ##
+        #
+        # Measures a string.
+        #
+        # @param string The string.
+        #
+        # @return The length of the string.
+        #
+        ##
+
+        return self.MeasureMany([string])[0]
+
+    def MeasureMany(self, strings: Iterable[str]) -> List[int]:
+
+        ##
+        #
+        # Measures strings.
+        #
+        # @param strings The strings.
+        #
+        # @return The lengths of the strings.
+        #
+        ##
+
+        strings = list(strings)
+        lengths = [len(x) for x in strings]
+
+        complexIndices = self._GetComplexIndices(strings)
+        if complexIndices:
+            complexLengths, _ = self._GetLengthsAndCuts([strings[x] for x in complexIndices], 0)
+
+            for index, length in zip(complexIndices, complexLengths.tolist()):
+                lengths[index] = length
+
+        return lengths
+
+    def Truncate(self, string: str, length: int) -> str:
+
+        ##
+        #
+        # Truncates a string to given length. Adds the suffix at the end (if necessary).
+        #
+        # @param string The string to be truncated.
+        # @param length Maximum length of the output string.
+        #
+        # @return The truncated string.
+        #
+        ##
+
+        return self._TruncateMany([string], length, byWords = False)[0]
+
+    def TruncateByWords(self, string: str, length: int) -> str:
+
+        ##
+        #
+        # Truncates a string to given length while trying to avoid cutting words in the middle.
+        #
+        # @param string The string to be truncated.
+        # @param length Maximum length of the output string.
+        #
+        # @return The truncated string.
+        #
+        ##
+
+        return self._TruncateMany([string], length, byWords = True)[0]
+
+    def TruncateMany(self, strings: Iterable[str], length: int) -> List[str]:
+
+        ##
+        #
+        # Truncates strings to given length (see *Truncate*).
+        #
+        # @param strings The strings to be truncated.
+        # @param length  Maximum length of the output strings.
+        #
+        # @return The truncated strings.
+        #
+        ##
+
+        return self._TruncateMany(strings, length, byWords = False)
+
+    def TruncateManyByWords(self, strings: Iterable[str], length: int) -> List[str]:
+
+        ##
+        #
+        # Truncates strings to given length while trying to avoid cutting words in the middle (see
+        # *TruncateByWords*).
+        #
+        # @param strings The strings to be truncated.
+        # @param length  Maximum length of the output strings.
+        #
+        # @return The truncated strings.
+        #
+        ##
+
+        return self._TruncateMany(strings, length, byWords = True)
+
+    def _Cut(self, string: str, position: int, byWords: bool) -> str:
+
+        ##
+        #
+        # Cuts a string at given position, and adds the suffix.
+        #
+        # @param string   The string.
+        # @param position The position (in code points).
+        # @param byWords  Should the string be cut at the last space before the position?
+        #
+        # @return The truncated string.
+        #
+        ##
+
+        if byWords:
+            spacePosition = string.rfind(" ", 0, position)
+            if -1 != spacePosition:
+                return string[:spacePosition] + self._suffix
+
+            return string[:position] + self._suffix
+
+        return string[:position].rstrip() + self._suffix
+
+    def _GetComplexIndices(self, strings: List[str]) -> List[int]:
+
+        ##
+        #
+        # Finds the strings whose length isn't simply their number of code points.
+        #
+        # @param strings The strings.
+        #
+        # @return The indices of the strings.
+        #
+        ##
+
+        if "characters" == self._measure:
+            return []
+
+        return [
+            index for index, string in enumerate(strings)
+            if not (string.isascii() and string.isprintable())
+        ]
+
+    def _GetLengthsAndCuts(
+        self,
+        strings: List[str],
+        limit: int
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+
+        ##
+        #
+        # Measures strings, and finds the positions at which they should be cut. All the strings are
+        # processed at once.
+        #
+        # @param strings The strings.
+        # @param limit   The maximum length of the part of each string preceding the cut.
+        #
+        # @return A tuple of two arrays: the lengths of the strings, and the cut positions (in code
+        #         points). Strings are never cut inside a grapheme cluster (in the "graphemes"
+        #         mode), or between a character and its zero-width followers (in the "width" mode).
+        #
+        ##
+
+        stringLengths = numpy.fromiter(map(len, strings), dtype = numpy.int64, count = len(strings))
+        offsets = numpy.zeros(len(strings), dtype = numpy.int64)
+        numpy.cumsum(stringLengths[:-1], out = offsets[1:])
+
+        codes = numpy.frombuffer(
+            "".join(strings).encode("utf-32-le", "surrogatepass"),
+            dtype = "<u4"
+        )
+
+        units = _GetMeasurementUnits(codes, offsets, self._measure)
+
+        # cumulativeUnits[n] is the total length of the first n code points.
+
+        cumulativeUnits = numpy.zeros(len(codes) + 1, dtype = numpy.int64)
+        numpy.cumsum(units, out = cumulativeUnits[1:])
+
+        startingUnits = cumulativeUnits[offsets]
+        lengths = cumulativeUnits[offsets + stringLengths] - startingUnits
+
+        cuts = numpy.searchsorted(cumulativeUnits, startingUnits + limit, side = "right") - 1
+        cuts = numpy.minimum(cuts - offsets, stringLengths)
+
+        return lengths, cuts
+
+    def _TruncateMany(self, strings: Iterable[str], length: int, byWords: bool) -> List[str]:
+
+        ##
+        #
+        # Truncates strings to given length.
+        #
+        # @param strings The strings to be truncated.
+        # @param length  Maximum length of the output strings.
+        # @param byWords Should the strings be cut at word boundaries?
+        #
+        # @return The truncated strings.
+        #
+        ##
+
+        strings = list(strings)
+        truncatedStrings = list(strings)
+
+        limit = max(0, length - self._suffixLength)
+
+        complexIndices = self._GetComplexIndices(strings)
+        complexIndexSet = set(complexIndices)
+
+        for index, string in enumerate(strings):
+            if (len(string) > length) and (index not in complexIndexSet):
+                truncatedStrings[index] = self._Cut(string, limit, byWords)
+
+        if complexIndices:
+            lengths, cuts = self._GetLengthsAndCuts([strings[x] for x in complexIndices], limit)
+
+            for index, stringLength, cut in zip(complexIndices, lengths.tolist(), cuts.tolist()):
+                if stringLength > length:
+                    truncatedStrings[index] = self._Cut(strings[index], cut, byWords)
+
+        return truncatedStrings
+
+#
+#
+#
+# Private functions.
+#
+#
+#
+
+@lru_cache(maxsize = TEMPLATE_CACHE_SIZE)
+def _CompileTemplate(template: str) -> CompiledTemplate:
+
+    ##
+    #
+    # Compiles a template, caching the result.
+    #
+    # @param template Template code.
+    #
+    # @return The compiled template.
+    #
+    ##
+
+    return CompiledTemplate(template)
+
+def _DeprettifyPlainNumbers(text: str) -> Tuple[numpy.ndarray, numpy.ndarray]:
+
+    ##
+    #
+    # Converts plain numbers (see *DeprettifyNumbers*) to integers, all at once. The work is
+    # proportional to the total length of the numbers.
+    #
+    # @param text The numbers (without commas), one per line, each preceded by a zero.
+    #
+    # @return A tuple (integers, plain number mask). Numbers which aren't plain are zeros.
+    #
+    ##
+
+    codes = numpy.frombuffer(text.encode("ascii", errors = "replace"), dtype = numpy.uint8)
+
+    isLineBreak = (codes == ord("\n"))
+    invalidPositions = numpy.flatnonzero(((codes < ord("0")) | (codes > ord("9"))) & ~isLineBreak)
+
+    lineBreaks = numpy.flatnonzero(isLineBreak)
+    lineLengths = numpy.diff(lineBreaks, prepend = -1, append = len(codes)) - 2
+
+    # Plain numbers contain nothing but digits (apart from the leading zero).
+
+    isPlain = (lineLengths >= 1) & (lineLengths <= MAXIMUM_PLAIN_NUMBER_LENGTH)
+    isPlain[numpy.searchsorted(lineBreaks, invalidPositions)] = False
+
+    # Replace invalid characters with zeros, so that every line can be parsed. Lines which are too
+    # long saturate; neither they nor the replaced ones are used.
+
+    if len(invalidPositions):
+        codes = codes.copy()
+        codes[invalidPositions] = ord("0")
+
+    results = numpy.fromstring(codes.tobytes(), dtype = numpy.int64, sep = "\n")
+    results[~isPlain] = 0
+
+    return results, isPlain
+
+def _GetBitParallelLevenshteinDistance(
+    patternBitmasks: Dict[str, int],
+    patternLength: int,
+    text: str,
+    maxDistance: Optional[int] = None
+) -> int:
+
+    ##
+    #
+    # Calculates the Levenshtein distance between a pattern and a text using Myers' bit-parallel
+    # algorithm. The pattern is described by its bitmasks (see *_GetPatternBitmasks*).
+    #
+    # @param patternBitmasks The pattern bitmasks.
+    # @param patternLength   The length of the pattern.
+    # @param text            The text.
+    # @param maxDistance     The maximum distance of interest. Optional.
+    #
+    # @return The distance between the pattern and the text; *maxDistance + 1* if the distance
+    #         exceeds *maxDistance*.
+    #
+    ##
+
+    if not patternLength:
+        return len(text)
+
+    mask = (1 << patternLength) - 1
+    lastBit = 1 << (patternLength - 1)
+
+    positiveVector = mask
+    negativeVector = 0
+    distance = patternLength
+    remainingCharacters = len(text)
+
+    for character in text:
+
+        matches = patternBitmasks.get(character, 0)
+
+        verticalCandidates = matches | negativeVector
+        horizontalCandidates = (
+            (((matches & positiveVector) + positiveVector) ^ positiveVector) | matches
+        )
+
+        positiveHorizontal = negativeVector | ~(horizontalCandidates | positiveVector)
+        negativeHorizontal = positiveVector & horizontalCandidates
+
+        if positiveHorizontal & lastBit:
+            distance += 1
+        elif negativeHorizontal & lastBit:
+            distance -= 1
+
+        remainingCharacters -= 1
+
+        # Every remaining character can lower the distance by one, at most.
+
+        if (maxDistance is not None) and (distance - remainingCharacters > maxDistance):
+            return maxDistance + 1
+
+        positiveHorizontal = (positiveHorizontal << 1) | 1
+        negativeHorizontal = negativeHorizontal << 1
+
+        positiveVector = (negativeHorizontal | ~(verticalCandidates | positiveHorizontal)) & mask
+        negativeVector = positiveHorizontal & verticalCandidates & mask
+
+    if (maxDistance is not None) and (distance > maxDistance):
+        return maxDistance + 1
+
+    return distance
+
+@lru_cache(maxsize = None)
+def _GetCharacterTables() -> Tuple[numpy.ndarray, numpy.ndarray]:
+
+    ##
+    #
+    # Builds the tables describing every code point (see *GetDisplayWidth* and *Truncator*). The
+    # tables are built only once, on first use.
+    #
+    # @return A tuple of two arrays, indexed by code points: the display widths of characters, and
+    #         whether they extend the preceding grapheme cluster.
+    #
+    ##
+
+    widths = numpy.ones(0x110000, dtype = numpy.uint8)
+    extenders = numpy.zeros(0x110000, dtype = bool)
+
+    for start, end in CHARACTER_TABLE_RANGES:
+        for code in range(start, end):
+            character = chr(code)
+            category = unicodedata.category(character)
+
+            if category in ("Mn", "Me", "Cf", "Cc"):
+                widths[code] = 0
+
+            # Unassigned code points are reported as fullwidth; treat them as ordinary characters.
+
+            elif "Cn" == category:
+                widths[code] = 1
+
+            elif unicodedata.east_asian_width(character) in ("W", "F"):
+                widths[code] = 2
+
+            if category in ("Mn", "Me", "Mc"):
+                extenders[code] = True
+
+    # Hangul vowel and trailing consonant jamos, and emoji skin tone modifiers.
+
+    for start, end in [(0x1160, 0x1200), (0xD7B0, 0xD800), (0x1F3FB, 0x1F400)]:
+        widths[start:end] = 0
+        extenders[start:end] = True
+
+    # Emoji tags and the zero-width joiner.
+
+    extenders[0xE0020:0xE0080] = True
+    extenders[ZERO_WIDTH_JOINER] = True
+
+    return widths, extenders
+
+def _GetCommonPrefix(strings: List[str]) -> str:
+
+    ##
+    #
+    # Finds the common prefix of strings. The common prefix of all the strings is the common prefix
+    # of the lexicographically first and last of them.
+    #
+    # @param strings A non-empty list of strings.
+    #
+    # @return The common prefix.
+    #
+    ##
+
+    firstString = min(strings)
+    lastString = max(strings)
+
+    for index, (firstCharacter, lastCharacter) in enumerate(zip(firstString, lastString)):
+        if firstCharacter != lastCharacter:
+            return firstString[:index]
+
+    return firstString
+
+@lru_cache(maxsize = None)
+def _GetDateFormatter(inputFormat: str, locale: str) -> DateFormatter:
+
+    ##
+    #
+    # Returns the date formatter used by *PrettifyDate*, creating it when first needed.
+    #
+    # @param inputFormat The format of the input dates.
+    # @param locale      The locale to be used for formatting.
+    #
+    # @return The date formatter.
+    #
+    ##
+
+    return DateFormatter(inputFormat, locale)
+
+@lru_cache(maxsize = None)
+def _GetDefaultSubtitleSeparator() -> SubtitleSeparator:
+
+    ##
+    #
+    # Returns the subtitle separator used by *SeparateSubtitle*, creating it when first needed.
+    #
+    # @return The subtitle separator.
+    #
+    ##
+
+    return SubtitleSeparator()
+
+@lru_cache(maxsize = None)
+def _GetDefaultTitleNormalizer() -> TitleNormalizer:
+
+    ##
+    #
+    # Returns the title normalizer used by *PrettifyTitle*, creating it when first needed.
+    #
+    # @return The title normalizer.
+    #
+    ##
+
+    return TitleNormalizer()
+
+def _GetFastTitlecase(text: str) -> Optional[str]:
+
+    ##
+    #
+    # Converts text to title case, following the rules of the *titlecase* package. Handles only
+    # single-line ASCII text made of plain words (letters and digits, optionally surrounded by
+    # single punctuation characters) and of tokens without letters.
+    #
+    # @param text The input text.
+    #
+    # @return The input text, in title case; or **None**, if the text can't be handled.
+    #
+    ##
+
+    if (not text.isascii()) or ("\t" in text) or ("\r" in text) or ("\n" in text):
+        return None
+
+    isAllCaps = (text.upper() == text)
+    words = text.split(" ")
+
+    # Process the words one by one.
+
+    for index, word in enumerate(words):
+
+        if word.isalpha():
+
+            prefix, core, suffix = "", word, ""
+
+        else:
+
+            parts = _SplitTitlecaseWord(word)
+
+            if not parts:
+
+                # Words without letters are left as they are; any other words are too complex.
+
+                if word.lower() != word.upper():
+                    return None
+
+                continue
+
+            prefix, core, suffix = parts
+
+        lowercaseCore = core.lower()
+
+        if (not prefix) and ("." == suffix):
+
+            # Initials ("A.").
+
+            if isAllCaps and (1 == len(core)) and core.isalpha():
+                continue
+
+            # "v." and "vs.", which the titlecase package treats in a special way.
+
+            if lowercaseCore in ("v", "vs"):
+                return None
+
+        if not prefix:
+
+            # Scottish and Irish names ("McDonald").
+
+            if (lowercaseCore[:2] == "mc") and (core[:2] != "mC") and (len(word) >= 4):
+                return None
+
+            # Honorifics.
+
+            if (not suffix) and (lowercaseCore in TITLECASE_HONORIFICS):
+                words[index] = core[0].upper() + core[1:]
+                continue
+
+        # Words with capital letters inside ("iPhone").
+
+        if (not isAllCaps) and (core[1:] != lowercaseCore[1:]):
+
+            leadingLetterCount = len(core) - len(core.lstrip(ascii_letters))
+            if core[1:leadingLetterCount] != lowercaseCore[1:leadingLetterCount]:
+                continue
+
+        if (not prefix) and (not suffix):
+
+            # Small words.
+
+            if lowercaseCore in TITLECASE_SMALL_WORDS:
+                words[index] = lowercaseCore
+                continue
+
+            # Acronyms (made solely of consonants).
+
+            if (len(core) > 2) and (not core.strip(TITLECASE_CONSONANTS)):
+                words[index] = core.upper()
+                continue
+
+        if isAllCaps:
+            core = lowercaseCore
+
+        words[index] = prefix + core[0].upper() + core[1:] + suffix
+
+    # Capitalize small words at the beginning and at the end.
+
+    for index in {0, len(words) - 1}:
+
+        parts = _SplitTitlecaseWord(words[index])
+
+        if parts and (parts[1].lower() in TITLECASE_SMALL_WORDS):
+            words[index] = parts[0] + parts[1].capitalize() + parts[2]
+
+    # Capitalize small words starting sub-phrases.
+
+    for index in range(1, len(words)):
+
+        previousWord = words[index - 1]
+
+        if previousWord and (previousWord[-1] in TITLECASE_SUBPHRASE_PUNCTUATION):
+
+            word = words[index]
+
+            if word[:1].islower() and any(word.startswith(x) for x in TITLECASE_SMALL_WORDS):
+                words[index] = word[0].upper() + word[1:]
+
+    return " ".join(words)
+
+def _GetLevenshteinDistanceMatrixRows(
+    firstStrings: List[str],
+    secondStrings: List[str],
+    maxDistance: Optional[int]
+) -> numpy.ndarray:
+
+    ##
+    #
+    # Calculates a block of rows of the Levenshtein distance matrix. A module-level function, so
+    # that it can be sent to worker processes.
+    #
+    # The column strings are encoded once into an array of character codes, and every row is then
+    # compared against all of them at the same time, using the bit-parallel algorithm on 64-bit
+    # words. Rows longer than 64 characters are handled one pair at a time.
+    #
+    # @param firstStrings  The strings corresponding to the rows.
+    # @param secondStrings The strings corresponding to the columns.
+    # @param maxDistance   The maximum distance of interest. Optional.
+    #
+    # @return The matrix of distances.
+    #
+    ##
+
+    matrix = numpy.empty((len(firstStrings), len(secondStrings)), dtype = numpy.int32)
+
+    # Encode the column strings, sorting them by length (longest first), so that the columns still
+    # being processed always form a prefix of the arrays. Code 0 stands for "no character".
+
+    columnOrder = sorted(
+        range(len(secondStrings)),
+        key = lambda index: len(secondStrings[index]),
+        reverse = True
+    )
+
+    characterCodes = {}
+    for string in secondStrings:
+        for character in string:
+            characterCodes.setdefault(character, len(characterCodes) + 1)
+
+    columnLengths = numpy.array([len(secondStrings[x]) for x in columnOrder], dtype = numpy.int64)
+    maximumLength = int(columnLengths[0]) if len(columnLengths) else 0
+
+    codes = numpy.zeros((len(columnOrder), maximumLength), dtype = numpy.int64)
+    for rowIndex, columnIndex in enumerate(columnOrder):
+        string = secondStrings[columnIndex]
+        codes[rowIndex, :len(string)] = [characterCodes[x] for x in string]
+
+    activeColumnCounts = [int(numpy.count_nonzero(columnLengths > x)) for x in range(maximumLength)]
+    codes = numpy.ascontiguousarray(codes.T)
+
+    # Prepare the buffers reused by all the rows.
+
+    positiveVector = numpy.empty(len(columnOrder), dtype = numpy.uint64)
+    negativeVector = numpy.empty(len(columnOrder), dtype = numpy.uint64)
+    distances = numpy.empty(len(columnOrder), dtype = numpy.int64)
+    patternBitmaskTable = numpy.zeros(len(characterCodes) + 1, dtype = numpy.uint64)
+
+    one = numpy.uint64(1)
+
+    # Process the rows.
+
+    for rowIndex, firstString in enumerate(firstStrings):
+
+        patternLength = len(firstString)
+
+        if not patternLength:
+
+            distances[:] = columnLengths
+
+        elif patternLength > 64:
+
+            patternBitmasks = _GetPatternBitmasks(firstString)
+
+            for index, columnIndex in enumerate(columnOrder):
+                distances[index] = _GetBitParallelLevenshteinDistance(
+                    patternBitmasks,
+                    patternLength,
+                    secondStrings[columnIndex]
+                )
+
+        else:
+
+            patternBitmaskTable[:] = 0
+            for character, bitmask in _GetPatternBitmasks(firstString).items():
+                if character in characterCodes:
+                    patternBitmaskTable[characterCodes[character]] = bitmask
+
+            mask = numpy.uint64((1 << patternLength) - 1)
+            lastBit = numpy.uint64(1 << (patternLength - 1))
+
+            positiveVector[:] = mask
+            negativeVector[:] = 0
+            distances[:] = patternLength
+
+            for characterIndex, activeColumnCount in enumerate(activeColumnCounts):
+
+                positiveSlice = positiveVector[:activeColumnCount]
+                negativeSlice = negativeVector[:activeColumnCount]
+
+                matches = patternBitmaskTable[codes[characterIndex, :activeColumnCount]]
+
+                verticalCandidates = matches | negativeSlice
+                horizontalCandidates = (
+                    (((matches & positiveSlice) + positiveSlice) ^ positiveSlice) | matches
+                )
+
+                positiveHorizontal = negativeSlice | ~(horizontalCandidates | positiveSlice)
+                negativeHorizontal = positiveSlice & horizontalCandidates
+
+                distances[:activeColumnCount] += (positiveHorizontal & lastBit) != 0
+                distances[:activeColumnCount] -= (negativeHorizontal & lastBit) != 0
+
+                positiveHorizontal = (positiveHorizontal << one) | one
+                negativeHorizontal = negativeHorizontal << one
+
+                positiveSlice[:] = (
+                    (negativeHorizontal | ~(verticalCandidates | positiveHorizontal)) & mask
+                )
+                negativeSlice[:] = positiveHorizontal & verticalCandidates & mask
+
+        matrix[rowIndex, columnOrder] = distances
+
+    if maxDistance is not None:
+        numpy.minimum(matrix, maxDistance + 1, out = matrix)
+
+    return matrix
+
+def _GetMeasurementUnits(
+    codes: numpy.ndarray,
+    offsets: numpy.ndarray,
+    measure: str
+) -> numpy.ndarray:
+
+    ##
+    #
+    # Calculates the contribution of every code point to the length of a string (see *Truncator*).
+    #
+    # @param codes   The code points of one or more concatenated strings.
+    # @param offsets The starting positions of the strings.
+    # @param measure The unit of length (see *TRUNCATION_MEASURES*).
+    #
+    # @return An array of lengths, one for each code point.
+    #
+    ##
+
+    if "characters" == measure:
+        return numpy.ones(len(codes), dtype = numpy.int64)
+
+    widths, extenders = _GetCharacterTables()
+    offsets = offsets[offsets < len(codes)]
+
+    # Characters following a zero-width joiner are merged with the preceding character.
+
+    isJoined = numpy.zeros(len(codes), dtype = bool)
+    isJoined[1:] = (ZERO_WIDTH_JOINER == codes[:-1])
+    isJoined[offsets] = False
+
+    if "width" == measure:
+        units = widths[codes].astype(numpy.int64)
+        units[isJoined] = 0
+
+        return units
+
+    # Every character which doesn't extend the preceding one starts a new grapheme cluster. Also,
+    # CR LF forms a single cluster, and so does every pair of regional indicators.
+
+    isClusterStart = ~(extenders[codes] | isJoined)
+    isClusterStart[1:] &= ~((13 == codes[:-1]) & (10 == codes[1:]))
+
+    isRegionalIndicator = (codes >= 0x1F1E6) & (codes <= 0x1F1FF)
+    if isRegionalIndicator.any():
+        positions = numpy.arange(len(codes))
+
+        isStringStart = numpy.zeros(len(codes), dtype = bool)
+        isStringStart[offsets] = True
+
+        runStarts = numpy.where(~isRegionalIndicator, positions + 1, 0)
+        runStarts = numpy.where(isRegionalIndicator & isStringStart, positions, runStarts)
+        runStarts = numpy.maximum.accumulate(runStarts)
+
+        isClusterStart &= ~(isRegionalIndicator & (1 == (positions - runStarts) % 2))
+
+    isClusterStart[offsets] = True
+
+    return isClusterStart.astype(numpy.int64)
+
+@lru_cache(maxsize = None)
+def _GetNumberFormatter(locale: str, isZeroSpecial: bool) -> NumberFormatter:
+
+    ##
+    #
+    # Returns the number formatter used by *PrettifyNumber*, creating it when first needed.
+    #
+    # @param locale        The locale to be used for formatting.
+    # @param isZeroSpecial Should we replace zero with a question mark (0 -> "?")?
+    #
+    # @return The number formatter.
+    #
+    ##
+
+    return NumberFormatter(locale, isZeroSpecial)
+
+def _GetPatternBitmasks(pattern: str) -> Dict[str, int]:
+
+    ##
+    #
+    # Prepares the bitmasks used by the bit-parallel Levenshtein distance calculation: for every
+    # character of the pattern, a bitmask of the positions it occupies.
+    #
+    # @param pattern The pattern.
+    #
+    # @return A dictionary mapping characters to bitmasks.
+    #
+    ##
+
+    bitmasks = {}
+
+    for index, character in enumerate(pattern):
+        bitmasks[character] = bitmasks.get(character, 0) | (1 << index)
+
+    return bitmasks
+
+@lru_cache(maxsize = None)
+def _GetRomanNumeralTables() -> Tuple[List[Optional[str]], Dict[str, int]]:
+
+    ##
+    #
+    # Returns the lookup tables for Roman numerals, creating them when first needed.
+    #
+    # @return A tuple: a list mapping integers to numerals (at index 0 there's **None**), and a
+    #         dictionary mapping numerals to integers.
+    #
+    ##
+
+    numerals = [None]
+
+    for number in range(1, MAXIMUM_ROMAN_NUMERAL + 1):
+
+        numeral = []
+        remainder = number
+
+        for value, symbol in ROMAN_NUMERAL_VALUES:
+            count, remainder = divmod(remainder, value)
+            numeral.append(symbol * count)
+
+        numerals.append("".join(numeral))
+
+    values = {numeral: number for number, numeral in enumerate(numerals) if numeral}
+
+    return (numerals, values)
+
+def _GetStringArray(strings: Union[Iterable[str], numpy.ndarray]) -> numpy.ndarray:
+
+    ##
+    #
+    # Converts a sequence of strings to a one-dimensional array of strings. **None** values are
+    # replaced with empty strings.
+    #
+    # @param strings The strings (a sequence of strings, or an array).
+    #
+    # @return The array.
+    #
+    ##
+
+    if isinstance(strings, numpy.ndarray) and (strings.dtype.kind == "U"):
+        return strings.ravel()
+
+    return numpy.array([x or "" for x in strings], dtype = str).ravel()
+
+def _GetStringList(values: Iterable[Any]) -> List[str]:
+
+    ##
+    #
+    # Converts a sequence of values to a list of strings. **None** values are replaced with empty
+    # strings, other values are converted using *str*.
+    #
+    # @param values The values.
+    #
+    # @return The list.
+    #
+    ##
+
+    return [x if isinstance(x, str) else str(x or "") for x in values]
+
+def _IsBuffer(value: Any) -> bool:
+
+    ##
+    #
+    # Checks whether given object is a buffer which should be treated as bytes (see
+    # *BUFFER_TYPES*).
+    #
+    # @param value The object.
+    #
+    # @return **True** if the object is such a buffer, **False** otherwise.
+    #
+    ##
+
+    return isinstance(value, BUFFER_TYPES)
+
+@lru_cache(maxsize = None)
+def _IsLegacyASCIICompatibleEncoding(encoding: str) -> bool:
+
+    ##
+    #
+    # Checks whether pure ASCII input in given encoding should be decoded using the ASCII codec (see
+    # *LEGACY_ASCII_COMPATIBLE_ENCODINGS*).
+    #
+    # @param encoding The name of the encoding.
+    #
+    # @return **True** if the encoding is a legacy ASCII-compatible one, **False** otherwise.
+    #
+    ##
+
+    try:
+        return codecs.lookup(encoding).name in LEGACY_ASCII_COMPATIBLE_ENCODINGS
+
+    except LookupError:
+        return False
+
+def _IterateByteChunks(source: Any, chunkSize: int) -> Iterator[Union[bytes, str]]:
+
+    ##
+    #
+    # Splits the input of *StringifyChunks* into chunks.
+    #
+    # @param source    The input (see *StringifyChunks*).
+    # @param chunkSize The size of the chunks read from buffers and files.
+    #
+    # @return An iterator over the chunks.
+    #
+    ##
+
+    if source is None:
+        return
+
+    elif isinstance(source, (str, bytes)):
+        for index in range(0, len(source), chunkSize):
+            yield source[index:index + chunkSize]
+
+    elif _IsBuffer(source):
+        with memoryview(source) as view, view.cast("B") as byteView:
+            for index in range(0, len(byteView), chunkSize):
+                yield bytes(byteView[index:index + chunkSize])
+
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunkSize)
+            if not chunk:
+                break
+
+            yield chunk
+
+    else:
+        yield from source
+
+def _SplitTitlecaseWord(word: str) -> Optional[Tuple[str, str, str]]:
+
+    ##
+    #
+    # Splits a word into its prefix, core and suffix, as understood by *_GetFastTitlecase*.
+    #
+    # @param word The word.
+    #
+    # @return A tuple (prefix, core, suffix); or **None**, if the word has no letters, or has some
+    #         other form.
+    #
+    ##
+
+    if word.isalnum():
+        return ("", word, "") if not word.isdigit() else None
+
+    match = TITLECASE_WORD_EXPRESSION.fullmatch(word)
+
+    return match.groups() if match else None
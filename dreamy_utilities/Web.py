@@ -33,6 +33,8 @@ from dreamy_utilities.Text import Stringify
 
 # Standard packages.
 
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from requests import get, Session
 from typing import Optional
 from urllib.parse import urlparse
@@ -97,4 +99,37 @@ def GetSiteURL(URL: str) -> str:
 
     URL = urlparse(URL)
 
-    return f"{URL.scheme}://{URL.netloc}"
\ No newline at end of file
+    return f"{URL.scheme}://{URL.netloc}"
+
+def ParseRetryAfter(retryAfter: Optional[str]) -> Optional[float]:
+
+    ##
+    #
+    # Parses the value of the "Retry-After" header.
+    #
+    # @param retryAfter The value of the header: a number of seconds, or an HTTP date.
+    #
+    # @return The delay, in seconds; or **None**, if the value is missing or invalid.
+    #
+    ##
+
+    if not retryAfter:
+        return None
+
+    retryAfter = retryAfter.strip()
+
+    # Other Unicode digits (like "²") aren't valid here.
+
+    if retryAfter.isascii() and retryAfter.isdigit():
+        return float(retryAfter)
+
+    try:
+        date = parsedate_to_datetime(retryAfter)
+
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo = timezone.utc)
+
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
\ No newline at end of file
@@ -28,12 +28,20 @@
 
 # Application.
 
-from dreamy_utilities.Text import Stringify
+from dreamy_utilities.HTML import GetDefaultTagParser, ParseHTML
+from dreamy_utilities.RequestScheduler import RequestScheduler
+from dreamy_utilities.ResponseCache import ResponseCache
+from dreamy_utilities.RetryPolicy import RetryPolicy
+from dreamy_utilities.Text import Stringify, StringifyChunks
+from dreamy_utilities.Web import ParseRetryAfter
 
 # Standard packages.
 
-from requests import Session
-from typing import Optional, Union
+from concurrent.futures import as_completed, ThreadPoolExecutor
+from requests import Response, Session
+from time import monotonic, sleep
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 # Non-standard packages.
 
@@ -49,7 +57,10 @@ import cloudscraper
 #
 
 DEFAULT_TEXT_ENCODING = "utf-8"
-DEFAULT_TAG_PARSER = "html.parser"
+DEFAULT_TAG_PARSER = GetDefaultTagParser()
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_WORKER_COUNT = 8
+CONNECTION_POOL_SIZE = 32
 
 #
 #
@@ -70,7 +81,10 @@ class WebSession:
     def __init__(
         self,
         userAgent: str = "",
-        useCloudscraper: bool = False
+        useCloudscraper: bool = False,
+        scheduler: Optional[RequestScheduler] = None,
+        retryPolicy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None
     ) -> None:
 
         ##
@@ -79,10 +93,19 @@ class WebSession:
         #
         # @param userAgent       The user-agent to be used.
         # @param useCloudscraper Should the cloudscraper be used instead of ordinary session?
+        # @param scheduler       The scheduler limiting the rate of requests sent to every host.
+        #                        Optional; can be shared between sessions.
+        # @param retryPolicy     The policy deciding whether failed requests should be retried.
+        #                        Optional; by default, requests are never retried.
+        # @param cache           The cache of the responses to GET requests. Optional; can be shared
+        #                        between sessions.
         #
         ##
 
         self._userAgent = userAgent
+        self._scheduler = scheduler
+        self._retryPolicy = retryPolicy
+        self._cache = cache
 
         self.EnableCloudscraper(useCloudscraper)
 
@@ -98,25 +121,66 @@ class WebSession:
 
         self._session = cloudscraper.CloudScraper() if enable else Session()
 
+        # Keep enough connections open for concurrent requests (see *GetMany*). The cloudscraper
+        # uses its own adapter.
+
+        if not enable:
+            for prefix in ["http://", "https://"]:
+                self._session.mount(prefix, HTTPAdapter(pool_maxsize = CONNECTION_POOL_SIZE))
+
     def Get(
         self,
         URL: str,
         text: bool = True,
         textEncoding: str = DEFAULT_TEXT_ENCODING,
-        stream: bool = False
-    ) -> Optional[Union[bytes, str]]:
+        stream: bool = False,
+        withAttemptCount: bool = False
+    ) -> Union[Optional[Union[bytes, str]], Tuple[Optional[Union[bytes, str]], int]]:
 
 
         ##
         #
         # Retrieves data using a GET request.
         #
+        # @param URL              The URL.
+        # @param text             Should the response be converted to text?
+        # @param textEncoding     The text encoding to be used during the conversion.
+        # @param stream           Read data stream.
+        # @param withAttemptCount Should the number of attempts (see *RetryPolicy*) be returned as
+        #                         well? It's zero for responses served straight from the cache.
+        #
+        # @return Retrieved response (as *bytes* or *str*), or **None**; or, if *withAttemptCount*
+        #         is set, a tuple (retrieved response or **None**, number of attempts).
+        #
+        ##
+
+        data, attemptCount, exception = self._Get(URL, text, textEncoding, stream)
+
+        if exception is not None:
+            raise exception
+
+        return (data, attemptCount) if withAttemptCount else data
+
+    def GetChunks(
+        self,
+        URL: str,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING,
+        chunkSize: int = DEFAULT_CHUNK_SIZE
+    ) -> Optional[Union[Iterator[bytes], Iterator[str]]]:
+
+
+        ##
+        #
+        # Retrieves data using a GET request, piece by piece (without keeping the whole response in
+        # memory).
+        #
         # @param URL          The URL.
-        # @param text         Should the response be converted to text?
+        # @param text         Should the response be converted to text (see *Text.StringifyChunks*)?
         # @param textEncoding The text encoding to be used during the conversion.
-        # @param stream       Read data stream.
+        # @param chunkSize    The size of the chunks read from the response.
         #
-        # @return Retrieved response (as *bytes* or *str*), or **None**.
+        # @return An iterator over the chunks of the response (*bytes* or *str*), or **None**.
         #
         ##
 
@@ -128,17 +192,72 @@ class WebSession:
 
         # Send the request.
 
-        response = self._session.get(URL, headers = requestHeaders, stream = stream)
-        if (not response) or (200 != response.status_code):
+        response, _, exception = self._SendRequest(
+            "GET",
+            URL,
+            headers = requestHeaders,
+            stream = True
+        )
+
+        if exception is not None:
+            raise exception
+
+        if 200 != response.status_code:
+            response.close()
             return None
 
         # Process the response.
 
-        data = Stringify(response.content, encoding = textEncoding) if text else response.content
+        chunks = self._IterateChunks(response, chunkSize)
 
         # Return.
 
-        return data
+        return StringifyChunks(chunks, textEncoding) if text else chunks
+
+    def GetMany(
+        self,
+        URLs: Iterable[str],
+        maxWorkers: int = DEFAULT_WORKER_COUNT,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING,
+        asCompleted: bool = False,
+        withAttemptCounts: bool = False
+    ) -> Union[List[Tuple], Iterator[Tuple]]:
+
+
+        ##
+        #
+        # Retrieves data using multiple concurrent GET requests (see *Get*), sent from a pool of
+        # threads sharing this session.
+        #
+        # @param URLs              The URLs.
+        # @param maxWorkers        The maximum number of concurrent requests.
+        # @param text              Should the responses be converted to text?
+        # @param textEncoding      The text encoding to be used during the conversion.
+        # @param asCompleted       Should the results be returned as soon as they are available
+        #                          (instead of in the order of the URLs)?
+        # @param withAttemptCounts Should the numbers of attempts (see *Get*) be returned as well?
+        #
+        # @return A list of tuples (URL, retrieved response or **None**, raised exception or
+        #         **None**), in the order of the URLs; or, if *asCompleted* is set, an iterator over
+        #         such tuples, in the order of completion. If *withAttemptCounts* is set, every
+        #         tuple also contains the number of attempts.
+        #
+        ##
+
+        URLs = list(URLs)
+        arguments = (text, textEncoding, withAttemptCounts)
+
+        if asCompleted:
+            return self._GetManyAsCompleted(URLs, maxWorkers, *arguments)
+
+        if not URLs:
+            return []
+
+        with ThreadPoolExecutor(max_workers = min(maxWorkers, len(URLs))) as executor:
+            futures = [executor.submit(self._GetSafely, x, *arguments) for x in URLs]
+
+            return [future.result() for future in futures]
 
     def Post(
         self,
@@ -170,8 +289,17 @@ class WebSession:
 
         # Send the request.
 
-        response = self._session.post(URL, headers = requestHeaders, data = payload)
-        if (not response) or (200 != response.status_code):
+        response, _, exception = self._SendRequest(
+            "POST",
+            URL,
+            headers = requestHeaders,
+            data = payload
+        )
+
+        if exception is not None:
+            raise exception
+
+        if 200 != response.status_code:
             return None
 
         # Process the response.
@@ -185,7 +313,8 @@ class WebSession:
     def GetSoup(
         self,
         URL: str,
-        parser: str = DEFAULT_TAG_PARSER
+        parser: Optional[str] = DEFAULT_TAG_PARSER,
+        targets: Optional[Iterable[str]] = None
     ) -> Optional[BeautifulSoup]:
 
 
@@ -193,8 +322,12 @@ class WebSession:
         #
         # Retrieves tag soup using a GET request.
         #
-        # @param URL    The URL.
-        # @param parser The tag parser to be used.
+        # @param URL     The URL.
+        # @param parser  The tag parser to be used. Optional; by default, the fastest available
+        #                parser (*DEFAULT_TAG_PARSER*, see *HTML.GetDefaultTagParser*).
+        # @param targets CSS selectors (or tag names) of the elements of interest. Optional; if
+        #                provided, only the subtrees which may contain these elements are built (see
+        #                *HTML.SelectorStrainer*).
         #
         # @return Retrieved tag soup, or **None**.
         #
@@ -208,8 +341,363 @@ class WebSession:
 
         # Create the tag soup.
 
-        soup = BeautifulSoup(data, features = parser)
+        soup = ParseHTML(data, parser, targets)
+
+        # Return.
+
+        return soup
+
+    def GetElements(
+        self,
+        URL: str,
+        selectors: Iterable[str],
+        parser: Optional[str] = DEFAULT_TAG_PARSER
+    ) -> Optional[Dict[str, List[str]]]:
+
+
+        ##
+        #
+        # Retrieves the texts of the elements matching given CSS selectors. Only the parts of the
+        # page which may contain these elements are parsed (see *GetSoup*).
+        #
+        # @param URL       The URL.
+        # @param selectors The CSS selectors (or tag names).
+        # @param parser    The tag parser to be used. Optional.
+        #
+        # @return A dictionary mapping each selector to the (stripped) texts of the matching
+        #         elements, or **None**.
+        #
+        ##
+
+        # Get the tag soup.
+
+        selectors = list(selectors)
+
+        soup = self.GetSoup(URL, parser, targets = selectors)
+        if not soup:
+            return None
+
+        # Extract the texts.
+
+        return {
+            selector: [element.get_text().strip() for element in soup.select(selector)]
+            for selector in selectors
+        }
+
+    def _Get(
+        self,
+        URL: str,
+        text: bool,
+        textEncoding: str,
+        stream: bool
+    ) -> Tuple[Optional[Union[bytes, str]], int, Optional[Exception]]:
+
+
+        ##
+        #
+        # Retrieves data using a GET request (see *Get*), using the cache if there is one.
+        #
+        # @param URL          The URL.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        # @param stream       Read data stream.
+        #
+        # @return A tuple (retrieved response or **None**, number of attempts, exception raised by
+        #         the last attempt or **None**).
+        #
+        ##
+
+        # Prepare the headers.
+
+        requestHeaders = {
+            "User-Agent": self._userAgent
+        }
+
+        # Send the request.
+
+        if self._cache and not stream:
+            content, attemptCount, exception = self._GetCached(URL, requestHeaders)
+
+        else:
+            response, attemptCount, exception = self._SendRequest(
+                "GET",
+                URL,
+                headers = requestHeaders,
+                stream = stream
+            )
+
+            isSuccessful = (response is not None) and (200 == response.status_code)
+            content = response.content if isSuccessful else None
+
+        if content is None:
+            return None, attemptCount, exception
+
+        # Process the response.
+
+        data = Stringify(content, encoding = textEncoding) if text else content
 
         # Return.
 
-        return soup
\ No newline at end of file
+        return data, attemptCount, None
+
+    def _GetCached(
+        self,
+        URL: str,
+        requestHeaders: Dict[str, str]
+    ) -> Tuple[Optional[bytes], int, Optional[Exception]]:
+
+
+        ##
+        #
+        # Retrieves data using the cache (see *ResponseCache*). Fresh responses are served without
+        # sending any request; stale ones are revalidated using a conditional request, and served
+        # from the cache if the server responds with 304 (Not Modified).
+        #
+        # @param URL            The URL.
+        # @param requestHeaders The headers of the request.
+        #
+        # @return A tuple (content of the response or **None**, number of attempts, exception
+        #         raised by the last attempt or **None**).
+        #
+        ##
+
+        # Serve fresh responses straight from the cache.
+
+        cachedResponse = self._cache.Get(URL)
+
+        if cachedResponse and cachedResponse.isFresh:
+            return cachedResponse.content, 0, None
+
+        # Revalidate stale responses.
+
+        if cachedResponse:
+            requestHeaders = {**requestHeaders, **cachedResponse.GetValidationHeaders()}
+
+        response, attemptCount, exception = self._SendRequest(
+            "GET",
+            URL,
+            headers = requestHeaders
+        )
+
+        if exception is not None:
+            return None, attemptCount, exception
+
+        if cachedResponse and (304 == response.status_code):
+            self._cache.Refresh(URL)
+            return cachedResponse.content, attemptCount, None
+
+        if 200 != response.status_code:
+            return None, attemptCount, None
+
+        # Store the response (unless the server forbids it).
+
+        if "no-store" in response.headers.get("Cache-Control", "").lower():
+            self._cache.Remove(URL)
+
+        else:
+            self._cache.Store(
+                URL,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
+
+        return response.content, attemptCount, None
+
+    def _GetManyAsCompleted(
+        self,
+        URLs: List[str],
+        maxWorkers: int,
+        text: bool,
+        textEncoding: str,
+        withAttemptCounts: bool
+    ) -> Iterator[Tuple]:
+
+
+        ##
+        #
+        # Retrieves data using multiple concurrent GET requests, returning the results as soon as
+        # they are available (see *GetMany*).
+        #
+        # @param URLs              The URLs.
+        # @param maxWorkers        The maximum number of concurrent requests.
+        # @param text              Should the responses be converted to text?
+        # @param textEncoding      The text encoding to be used during the conversion.
+        # @param withAttemptCounts Should the numbers of attempts be returned as well?
+        #
+        # @return An iterator over tuples (URL, retrieved response, raised exception[, number of
+        #         attempts]).
+        #
+        ##
+
+        if not URLs:
+            return
+
+        arguments = (text, textEncoding, withAttemptCounts)
+
+        executor = ThreadPoolExecutor(max_workers = min(maxWorkers, len(URLs)))
+        futures = [executor.submit(self._GetSafely, x, *arguments) for x in URLs]
+
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+
+        finally:
+
+            # Don't send the remaining requests if the caller stops early.
+
+            for future in futures:
+                future.cancel()
+
+            executor.shutdown()
+
+    def _GetSafely(
+        self,
+        URL: str,
+        text: bool,
+        textEncoding: str,
+        withAttemptCount: bool
+    ) -> Tuple:
+
+
+        ##
+        #
+        # Retrieves data using a GET request (see *Get*), catching the exceptions.
+        #
+        # @param URL              The URL.
+        # @param text             Should the response be converted to text?
+        # @param textEncoding     The text encoding to be used during the conversion.
+        # @param withAttemptCount Should the number of attempts be returned as well?
+        #
+        # @return A tuple (URL, retrieved response or **None**, raised exception or **None**[,
+        #         number of attempts]).
+        #
+        ##
+
+        try:
+            data, attemptCount, exception = self._Get(URL, text, textEncoding, False)
+
+        except Exception as raisedException:
+            data, attemptCount, exception = None, 0, raisedException
+
+        if withAttemptCount:
+            return URL, data, exception, attemptCount
+
+        return URL, data, exception
+
+    def _IterateChunks(self, response: Response, chunkSize: int) -> Iterator[bytes]:
+
+        ##
+        #
+        # Reads a streamed response piece by piece (see *GetChunks*), and closes it afterwards (also
+        # if the iteration is abandoned).
+        #
+        # @param response  The response.
+        # @param chunkSize The size of the chunks read from the response.
+        #
+        # @return An iterator over the chunks of the response.
+        #
+        ##
+
+        try:
+            yield from response.iter_content(chunkSize)
+
+        finally:
+            response.close()
+
+    def _SendRequest(
+        self,
+        method: str,
+        URL: str,
+        **arguments
+    ) -> Tuple[Optional[Response], int, Optional[Exception]]:
+
+
+        ##
+        #
+        # Sends a request, retrying it according to the retry policy (if there is one).
+        #
+        # @param method    The HTTP method.
+        # @param URL       The URL.
+        # @param arguments Other arguments of *Session.request*.
+        #
+        # @return A tuple (last response or **None**, number of attempts, exception raised by the
+        #         last attempt or **None**).
+        #
+        ##
+
+        startTime = monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            response = None
+            exception = None
+
+            try:
+                response = self._SendRequestOnce(method, URL, **arguments)
+
+            except Exception as raisedException:
+                exception = raisedException
+
+            isSuccessful = (exception is None) and (200 == response.status_code)
+
+            if self._retryPolicy and not isSuccessful:
+                statusCode = None
+                retryAfter = None
+
+                if response is not None:
+                    statusCode = response.status_code
+                    retryAfter = ParseRetryAfter(response.headers.get("Retry-After"))
+
+                delay = self._retryPolicy.GetDelay(attempt, retryAfter)
+                elapsedTime = monotonic() - startTime
+
+                if self._retryPolicy.ShouldRetry(
+                    attempt,
+                    elapsedTime,
+                    delay,
+                    statusCode,
+                    exception
+                ):
+                    if response is not None:
+                        response.close()
+
+                    sleep(delay)
+                    continue
+
+            return response, attempt, exception
+
+    def _SendRequestOnce(self, method: str, URL: str, **arguments) -> Response:
+
+
+        ##
+        #
+        # Sends a request, waiting for the scheduler (if there is one).
+        #
+        # @param method    The HTTP method.
+        # @param URL       The URL.
+        # @param arguments Other arguments of *Session.request*.
+        #
+        # @return The response.
+        #
+        ##
+
+        if not self._scheduler:
+            return self._session.request(method, URL, **arguments)
+
+        self._scheduler.Acquire(URL)
+
+        response = None
+
+        try:
+            response = self._session.request(method, URL, **arguments)
+            return response
+
+        finally:
+            self._scheduler.Release(
+                URL,
+                response.status_code if (response is not None) else None,
+                response.headers.get("Retry-After") if (response is not None) else None
+            )
\ No newline at end of file
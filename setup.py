@@ -58,10 +58,13 @@ setup(
     url = Configuration.ApplicationURL,
 
     install_requires = [
+        "aiohttp",
         "babel",
-        "bs4",
+        "beautifulsoup4 >= 4.13",
         "cloudscraper",
         "colorama",
+        "numpy",
+        "soupsieve",
         "termtables",
         "titlecase",
         "tldextract",